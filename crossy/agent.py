@@ -1,9 +1,13 @@
+import json
+import logging
+
 from swarm import Swarm, Agent
 
-client = Swarm()
-from .model import Crossword, Word
+from .model import Crossword, Direction, Word
 from typing import List, Dict
 
+logger = logging.getLogger(__name__)
+
 INSTRUCTIONS = """
 You are a helpful agent that builds simple crossword puzzles.
 You must add words to the crossword puzzle.
@@ -14,62 +18,180 @@ Before adding a word, you must check if it conflicts with any existing words.
 Each new word must intersect with at least one existing word.
 Always start with a word that intersects the middle of the grid.
 Only add 3 words to the crossword puzzle.
+add_word answers with JSON: the result, the cells the word filled as [x, y, letter],
+and "open": letters of the word that new words can still cross, as [x, y, letter, direction].
+Use find_placements to see where a word of some length fits and which letters it must use,
+and add_words to place several words in one call, passing them as a JSON array.
+Call view_crossword only if you need to see the whole grid.
 """
 
 class AgentExecutor:
     
-    def __init__(self, crossword: Crossword):
+    def __init__(self, crossword: Crossword, compact: bool = True):
         self.crossword: Crossword = crossword
+        # Compact tool responses only describe what changed; otherwise every response
+        # carries the full grid, which grows the conversation quadratically
+        self.compact = compact
         self.agent = Agent(
             name="Agent",
             model="gpt-4o-mini",
             instructions=INSTRUCTIONS,
-            functions=[self.add_word],
+            functions=[self.add_word, self.add_words, self.find_placements, self.view_crossword],
         )
-    def add_word(self,word: str, row: int, column: int, direction: str) -> None:
-        """
-        Add a word to the crossword puzzle.
-        You must specify the row and column of the first letter of the word.
-        You must specify the direction of the word, either "across" or "down".
-        """
-        response = f"Adding word: {word}\n"
-        
+
+    def _respond(self, word: str, error: str = "", cells: list | None = None, open_cells: list | None = None) -> str:
+        """Build a tool response, compact JSON or the text with the full grid."""
+        if self.compact:
+            response = {"word": word, "result": "error" if error else "added"}
+            if error:
+                response["error"] = error
+            else:
+                response["cells"] = cells
+                response["open"] = open_cells
+            response = json.dumps(response, separators=(",", ":"))
+        else:
+            status = error or "Word added successfully"
+            response = f"Adding word: {word}\n{status}\n{self.crossword.get_crossword_string()}"
+        logger.debug(response)
+        return response
+
+    def _open_cells(self, word: Word) -> list[list]:
+        """Letters of a placed word that a perpendicular word could still cross."""
+        cells = self.crossword.cells()
+        dx, dy = (0, 1) if word.direction == Direction.ACROSS else (1, 0)
+        crossing = Direction.DOWN if word.direction == Direction.ACROSS else Direction.ACROSS
+        open_cells = []
+        for x, y in self.crossword.word_coordinates(word):
+            if len(self.crossword.words_at(x, y)) > 1:
+                continue
+            if (x - dx, y - dy) in cells and (x + dx, y + dy) in cells:
+                continue
+            open_cells.append([x, y, cells[(x, y)], crossing.value])
+        return open_cells
+
+    @staticmethod
+    def _place(crossword: Crossword, word: str, row: int, column: int, direction: str) -> tuple[str, Word | None, list]:
+        """Add a word to a crossword; returns (error, placed word, newly filled cells)."""
         # validate the direction
         if direction not in ["across", "down"]:
-            error_msg = "Direction must be either 'across' or 'down'"
-            response += f"{error_msg}\n{self.crossword.get_crossword_string()}"
-            print(response)
-            return response
+            return "Direction must be either 'across' or 'down'", None, []
             
         # validate the row and column
-        if row < 0 or column < 0 or row >= self.crossword.width or column >= self.crossword.height:
-            error_msg = "Row and column must be within the bounds of the crossword puzzle"
-            response += f"{error_msg}\n{self.crossword.get_crossword_string()}"
-            print(response)
-            return response
+        if row < 0 or column < 0 or row >= crossword.width or column >= crossword.height:
+            return "Row and column must be within the bounds of the crossword puzzle", None, []
             
         try:
-            word = Word(word, row, column, direction)
-            self.crossword.add_word(word)   
-            response += f"Word added successfully\n{self.crossword.get_crossword_string()}"
-            print(response)
-            return response
-            
+            placed = Word(word, row, column, direction)
+            filled = set(crossword.cells())
+            crossword.add_word(placed)
         except ValueError as e:
-            error_msg = f"Failed to add word: {str(e)}"
-            response += f"{error_msg}\n{self.crossword.get_crossword_string()}"
-            print(response)
+            return f"Failed to add word: {str(e)}", None, []
+
+        cells = [
+            [x, y, crossword.cells()[(x, y)]]
+            for x, y in crossword.word_coordinates(placed)
+            if (x, y) not in filled
+        ]
+        return "", placed, cells
+
+    def add_word(self,word: str, row: int, column: int, direction: str) -> str:
+        """
+        Add a word to the crossword puzzle.
+        You must specify the row and column of the first letter of the word.
+        You must specify the direction of the word, either "across" or "down".
+        """
+        error, placed, cells = self._place(self.crossword, word, row, column, direction)
+        if error:
+            return self._respond(word, error=error)
+        return self._respond(placed.word, cells=cells, open_cells=self._open_cells(placed))
+
+    def add_words(self, placements: str) -> str:
+        """
+        Add several words to the crossword puzzle in one call, all or nothing.
+        placements is a JSON array of objects with "word", "row", "column" and "direction",
+        e.g. [{"word": "PIZZA", "row": 0, "column": 2, "direction": "across"}],
+        placed in order, so later words may cross earlier ones.
+        If any placement fails, no word is added; the results say which ones failed and why.
+        """
+        # Tool schemas are built from the annotations, and a bare list gives an array
+        # schema without items, which the API rejects, so the batch is passed as JSON text
+        try:
+            placements = json.loads(placements)
+        except (TypeError, ValueError):
+            placements = None
+        if not isinstance(placements, list):
+            response = json.dumps(
+                {"applied": False, "error": "placements must be a JSON array of placements"}, separators=(",", ":")
+            )
+            logger.debug(response)
             return response
+
+        # Try the whole batch on a copy first, so a failure leaves the puzzle untouched
+        trial = Crossword.from_bytes(self.crossword.to_bytes())
+        results = []
+        for placement in placements:
+            try:
+                word = str(placement["word"])
+                args = (int(placement["row"]), int(placement["column"]), str(placement["direction"]))
+            except (KeyError, TypeError, ValueError):
+                results.append({"placement": placement, "result": "error", "error": "Expected word, row, column and direction"})
+                continue
+            error, placed, cells = self._place(trial, word, *args)
+            if error:
+                results.append({"word": word, "result": "error", "error": error})
+            else:
+                results.append({"word": placed.word, "result": "ok", "cells": cells})
+
+        applied = bool(results) and all(result["result"] == "ok" for result in results)
+        if applied:
+            for placement in placements:
+                self._place(
+                    self.crossword, str(placement["word"]), int(placement["row"]),
+                    int(placement["column"]), str(placement["direction"]),
+                )
+        response = json.dumps({"applied": applied, "results": results}, separators=(",", ":"))
+        if not self.compact:
+            response += f"\n{self.crossword.get_crossword_string()}"
+        logger.debug(response)
+        return response
+
+    def find_placements(self, length: int, direction: str = "", limit: int = 20) -> str:
+        """
+        List where a word of the given length can be added, without changing the puzzle.
+        direction is "across", "down" or empty for both. Each entry has the row, column
+        and direction to pass to add_word and the letter pattern the word must match,
+        where '_' is any letter. At most limit entries are returned, crossing ones first.
+        """
+        directions = [direction] if direction in ("across", "down") else ["across", "down"]
+        entries = []
+        for name in directions:
+            for slot in self.crossword.get_open_placements(Direction(name), length):
+                pattern = self.crossword.get_letter_constraints_for_word(slot).to_string()
+                entries.append({"row": slot.pos_x, "column": slot.pos_y, "direction": name, "pattern": pattern})
+        # Positions sharing more letters are more useful to the puzzle, so they come first
+        entries.sort(key=lambda entry: entry["pattern"].count("_"))
+        response = json.dumps({"total": len(entries), "placements": entries[:limit]}, separators=(",", ":"))
+        logger.debug(response)
+        return response
+
+    def view_crossword(self) -> str:
+        """
+        Return the full crossword grid with coordinates and the list of clues.
+        Only call this when the add_word responses are not enough.
+        """
+        return self.crossword.get_crossword_string()
         
-    def show_crossword(self) -> None:
-        print("Showing crossword")
-        
-        print(self.crossword.get_crossword_string())
-        
-        return(self.crossword.get_crossword_string())
-    def run(self, messages: List[Dict[str, str]]) -> None:
+    def show_crossword(self) -> str:
+        logger.debug("Showing crossword")
+        return self.crossword.get_crossword_string()
+
+    def run(self, messages: List[Dict[str, str]]) -> str:
+        """Run the agent on a conversation and return its last message."""
+        client = Swarm()
         response = client.run(agent=self.agent, messages=messages)
-        print(response.messages[-1]["content"])
+        content = response.messages[-1]["content"]
+        logger.info("Agent finished: %s", content)
+        return content
 
 
 def build_crossword_puzzle(topic: str, rows: int, columns: int) -> str:
@@ -80,4 +202,4 @@ def build_crossword_puzzle(topic: str, rows: int, columns: int) -> str:
 
 
 if __name__ == "__main__":
-    build_crossword_puzzle("Pizza", 10, 10)
+    print(build_crossword_puzzle("Pizza", 10, 10))
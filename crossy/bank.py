@@ -0,0 +1,142 @@
+import os
+import random
+import sqlite3
+import struct
+import threading
+
+try:
+    import fcntl
+except ImportError:  # not on Windows, where a bank file must have a single writer process
+    fcntl = None
+
+from .model import Crossword
+
+# Records in the bank file are a byte length followed by Crossword.to_bytes()
+_RECORD_LENGTH = struct.Struct("<I")
+
+
+class PuzzleBank:
+    """
+    Append-only file of finished puzzles with an SQLite index next to it.
+
+    Puzzles are appended to `path` as length-prefixed Crossword.to_bytes() records and
+    indexed in `path + ".idx"` by theme, language, size and difficulty (a caller-defined
+    level, 0 by default) together with their offset. A lookup queries the index and then
+    reads exactly one record, so the bank never has to be loaded into memory. A record
+    whose index row is missing after a crash is simply never served. Appends hold an
+    exclusive lock on the file, so several processes can share one bank.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a+b")
+        self._connection = sqlite3.connect(path + ".idx", check_same_thread=False)
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS puzzles (
+                id INTEGER PRIMARY KEY,
+                theme TEXT NOT NULL,
+                language TEXT NOT NULL,
+                width INTEGER NOT NULL,
+                height INTEGER NOT NULL,
+                difficulty INTEGER NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS puzzles_by_kind ON puzzles (theme, language, width, height, difficulty);
+            CREATE INDEX IF NOT EXISTS puzzles_by_size ON puzzles (theme, language, width, height);
+        """)
+
+    @staticmethod
+    def _key(theme: str, language: str) -> tuple[str, str]:
+        return theme.strip().lower(), language.strip().lower()
+
+    def add(self, crossword: Crossword, theme: str, language: str, difficulty: int = 0) -> int:
+        """Append a puzzle to the bank and return its id."""
+        theme, language = self._key(theme, language)
+        record = crossword.to_bytes()
+        with self._lock:
+            # The threading lock covers this process, the file lock other processes
+            # appending to the same bank, from finding the end of the file to indexing it
+            if fcntl is not None:
+                fcntl.flock(self._file, fcntl.LOCK_EX)
+            try:
+                self._file.seek(0, os.SEEK_END)
+                offset = self._file.tell()
+                self._file.write(_RECORD_LENGTH.pack(len(record)) + record)
+                self._file.flush()
+                cursor = self._connection.execute(
+                    "INSERT INTO puzzles (theme, language, width, height, difficulty, offset, length)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (theme, language, crossword.width, crossword.height, difficulty, offset, len(record)),
+                )
+                self._connection.commit()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._file, fcntl.LOCK_UN)
+        return cursor.lastrowid
+
+    def _read(self, offset: int, length: int) -> Crossword:
+        with self._lock:
+            self._file.seek(offset + _RECORD_LENGTH.size)
+            record = self._file.read(length)
+        return Crossword.from_bytes(record)
+
+    def get(self, puzzle_id: int) -> Crossword | None:
+        """Load one puzzle by id."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT offset, length FROM puzzles WHERE id = ?", (puzzle_id,)
+            ).fetchone()
+        return self._read(*row) if row is not None else None
+
+    def count(self, theme: str, language: str, width: int, height: int, difficulty: int | None = None) -> int:
+        """Number of stored puzzles of this kind, of any difficulty if none is given."""
+        query, parameters = self._where(theme, language, width, height, difficulty)
+        with self._lock:
+            return self._connection.execute(f"SELECT COUNT(*) FROM puzzles WHERE {query}", parameters).fetchone()[0]
+
+    def find(
+        self,
+        theme: str,
+        language: str,
+        width: int,
+        height: int,
+        difficulty: int | None = None,
+        rng: random.Random | None = None,
+    ) -> Crossword | None:
+        """
+        Load a random stored puzzle of this kind, or return None if there is none.
+
+        Picks a random id between the smallest and largest id of the kind and takes the
+        first puzzle from there, two index lookups whatever the size of the bank. Puzzles
+        after a long run of ids of other kinds are picked more often than the rest.
+        """
+        query, parameters = self._where(theme, language, width, height, difficulty)
+        with self._lock:
+            # Separate queries, SQLite only answers a lone MIN or MAX from the index ends
+            first = self._connection.execute(f"SELECT MIN(id) FROM puzzles WHERE {query}", parameters).fetchone()[0]
+            if first is None:
+                return None
+            last = self._connection.execute(f"SELECT MAX(id) FROM puzzles WHERE {query}", parameters).fetchone()[0]
+            row = self._connection.execute(
+                f"SELECT offset, length FROM puzzles WHERE {query} AND id >= ? ORDER BY id LIMIT 1",
+                (*parameters, (rng or random).randint(first, last)),
+            ).fetchone()
+        return self._read(*row)
+
+    def _where(
+        self, theme: str, language: str, width: int, height: int, difficulty: int | None
+    ) -> tuple[str, tuple]:
+        theme, language = self._key(theme, language)
+        query = "theme = ? AND language = ? AND width = ? AND height = ?"
+        parameters: tuple = (theme, language, width, height)
+        if difficulty is not None:
+            query += " AND difficulty = ?"
+            parameters += (difficulty,)
+        return query, parameters
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+            self._connection.close()
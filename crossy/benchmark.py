@@ -0,0 +1,294 @@
+"""
+Offline benchmarks for the crossword generation pipeline.
+
+    python -m crossy.benchmark e2e --words words.txt --sizes 20x5:2 20x10:6 --puzzles 20
+    python -m crossy.benchmark model --output before.json
+    python -m crossy.benchmark model --output after.json
+    python -m crossy.benchmark compare before.json after.json --threshold 0.1
+"""
+import argparse
+import json
+import logging
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Callable
+
+from . import metrics
+from .blocked import build_blocked_crossword
+from .lexicon import load_lexicon
+from .llm import FakeClient, set_client
+from .model import Crossword, Word, generate_word_pattern
+from .pipeline import build_crossword_layout, fill_crossword_words
+from .render import FORMATS
+
+MODEL_SIZES = ["5x20:6", "20x20:40", "30x30:100", "50x50:300"]
+
+logger = logging.getLogger(__name__)
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def _parse_size(size: str) -> tuple[int, int, int]:
+    """Parse 'WIDTHxHEIGHT:WORDS', e.g. '20x10:6'."""
+    dimensions, num_words = size.split(":")
+    width, height = dimensions.lower().split("x")
+    return int(width), int(height), int(num_words)
+
+
+def run_end_to_end(
+    words_path: str,
+    sizes: list[tuple[int, int, int]],
+    puzzles: int,
+    latency: float = 0.0,
+    failure_rate: float = 0.0,
+    seed: int = 0,
+    theme: str = "Food",
+    language: str = "English",
+) -> list[dict]:
+    """
+    Build and fill puzzles against a FakeClient, the same way State.initialize_grid
+    and State.create_crossword do, and return one result row per puzzle size.
+    """
+    client = FakeClient(load_lexicon(words_path), latency=latency, failure_rate=failure_rate, seed=seed)
+    set_client(client)
+    metrics.enable()
+
+    results = []
+    for width, height, num_words in sizes:
+        metrics.reset()
+        durations = []
+        calls = []
+        retries = 0
+        failures = 0
+        for puzzle in range(puzzles):
+            random.seed(seed + puzzle)
+            client.reset_counters()
+            start = time.perf_counter()
+            try:
+                crossword = build_crossword_layout(width, height, num_words)
+                # The LLM path is measured, so the offline fill engine is not used here
+                fill_crossword_words(crossword, theme, language, word_list_path="")
+            except Exception:
+                # Any error from the client, its responses or the pipeline fails this puzzle only
+                logger.warning("Puzzle %d failed", puzzle, exc_info=True)
+                failures += 1
+            durations.append(time.perf_counter() - start)
+            calls.append(client.calls)
+            retries += client.retries
+
+        results.append({
+            "size": f"{width}x{height}:{num_words}",
+            "puzzles": puzzles,
+            "failures": failures,
+            "llm_calls_mean": sum(calls) / len(calls),
+            "retries": retries,
+            "wall_time": sum(durations),
+            "p50": _percentile(durations, 50),
+            "p95": _percentile(durations, 95),
+            "metrics": metrics.snapshot()["counters"],
+        })
+    return results
+
+
+def _print_end_to_end(results: list[dict]) -> None:
+    print(f"{'size':>10} {'puzzles':>8} {'failed':>7} {'calls':>7} {'retries':>8} {'wall s':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    for row in results:
+        print(
+            f"{row['size']:>10} {row['puzzles']:>8} {row['failures']:>7} {row['llm_calls_mean']:>7.1f}"
+            f" {row['retries']:>8} {row['wall_time']:>8.2f} {row['p50'] * 1000:>8.1f} {row['p95'] * 1000:>8.1f}"
+        )
+
+
+def _time(func: Callable[[], object], repeat: int) -> dict:
+    """Run func repeat times and summarize the durations in seconds."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return {
+        "repeat": repeat,
+        "min": min(durations),
+        "median": statistics.median(durations),
+        "mean": statistics.fmean(durations),
+    }
+
+
+def _build_crossword(width: int, height: int, words: list[Word]) -> Crossword:
+    crossword = Crossword(width, height)
+    for word in words:
+        crossword.add_word(word)
+    return crossword
+
+
+def run_model(sizes: list[tuple[int, int, int]], repeat: int = 5, seed: int = 0) -> list[dict]:
+    """
+    Time the crossy.model hot paths and the State.initialize_grid cell conversion on
+    seeded word patterns, one result row per benchmark and grid size. Times are for
+    the whole layout, e.g. adding or querying every word once.
+    """
+    # The Reflex app module is only needed for the cell conversion
+    from .crossy import crossword_to_rows
+
+    results = []
+    for width, height, num_words in sizes:
+        random.seed(seed)
+        words = generate_word_pattern(width, height, num_words)
+        crossword = _build_crossword(width, height, words)
+
+        def generate():
+            random.seed(seed)
+            generate_word_pattern(width, height, num_words)
+
+        benchmarks = {
+            "generate_word_pattern": generate,
+            # The blocked-grid engine fills the same size with its own number of words
+            "blocked": lambda: build_blocked_crossword(width, height, rng=random.Random(seed)),
+            "add_word": lambda: _build_crossword(width, height, words),
+            "get_letter_constraints_for_word": lambda: [
+                crossword.get_letter_constraints_for_word(word) for word in crossword.words
+            ],
+            "get_crossword_string": crossword.get_crossword_string,
+            # Uncached renders; get_crossword_string above is served from the render cache
+            **{
+                f"render_{fmt}": lambda fmt=fmt: "".join(FORMATS[fmt](crossword))
+                for fmt in ("text", "ipuz", "svg")
+            },
+            "initialize_grid_cells": lambda: crossword_to_rows(crossword),
+        }
+        for name, func in benchmarks.items():
+            results.append({
+                "benchmark": name,
+                "size": f"{width}x{height}:{num_words}",
+                "words": len(words),
+                **_time(func, repeat),
+            })
+    return results
+
+
+def _print_model(results: list[dict]) -> None:
+    print(f"{'benchmark':>32} {'size':>10} {'words':>6} {'min ms':>9} {'median ms':>10} {'mean ms':>9}")
+    for row in results:
+        print(
+            f"{row['benchmark']:>32} {row['size']:>10} {row['words']:>6} {row['min'] * 1000:>9.2f}"
+            f" {row['median'] * 1000:>10.2f} {row['mean'] * 1000:>9.2f}"
+        )
+
+
+def compare_results(baseline: list[dict], current: list[dict], threshold: float = 0.1) -> list[dict]:
+    """
+    Compare two result lists row by row, matched on benchmark and size, using the
+    median for model rows and p50 for end-to-end rows. A row is a regression when
+    it got slower by more than threshold, e.g. 0.1 for 10%.
+    """
+    def key(row: dict) -> tuple[str, str]:
+        return row.get("benchmark", "e2e"), row["size"]
+
+    def metric(row: dict) -> float:
+        return row["median"] if "median" in row else row["p50"]
+
+    baseline_rows = {key(row): row for row in baseline}
+    comparisons = []
+    for row in current:
+        before = baseline_rows.get(key(row))
+        if before is None:
+            continue
+        ratio = metric(row) / metric(before) if metric(before) else math.inf
+        comparisons.append({
+            "benchmark": key(row)[0],
+            "size": row["size"],
+            "baseline": metric(before),
+            "current": metric(row),
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold,
+        })
+    return comparisons
+
+
+def _print_comparison(comparisons: list[dict]) -> None:
+    print(f"{'benchmark':>32} {'size':>10} {'before ms':>10} {'after ms':>10} {'ratio':>7}")
+    for row in comparisons:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['benchmark']:>32} {row['size']:>10} {row['baseline'] * 1000:>10.2f}"
+            f" {row['current'] * 1000:>10.2f} {row['ratio']:>7.2f}{flag}"
+        )
+
+
+def _save_results(path: str, command: str, args: argparse.Namespace, results: list[dict]) -> None:
+    """Write results as JSON together with the settings and environment they were measured with."""
+    settings = {name: value for name, value in vars(args).items() if name not in ("command", "output")}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "command": command,
+            "settings": settings,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }, f, indent=2)
+
+
+def _load_results(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    e2e = commands.add_parser("e2e", help="layout + fill end to end against a local fake LLM")
+    e2e.add_argument("--words", required=True, help="word list or compiled lexicon the fake answers from")
+    e2e.add_argument("--sizes", nargs="+", default=["20x5:2", "20x10:6", "20x20:12"], help="WIDTHxHEIGHT:WORDS")
+    e2e.add_argument("--puzzles", type=int, default=10, help="puzzles per size")
+    e2e.add_argument("--latency", type=float, default=0.0, help="seconds per fake LLM call")
+    e2e.add_argument("--failure-rate", type=float, default=0.0, help="share of fake answers that break the pattern")
+    e2e.add_argument("--seed", type=int, default=0)
+    e2e.add_argument("--output", help="save results to this JSON file")
+
+    model = commands.add_parser("model", help="crossy.model hot paths at several grid sizes")
+    model.add_argument("--sizes", nargs="+", default=MODEL_SIZES, help="WIDTHxHEIGHT:WORDS")
+    model.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark")
+    model.add_argument("--seed", type=int, default=0)
+    model.add_argument("--output", help="save results to this JSON file")
+
+    compare = commands.add_parser("compare", help="flag regressions between two saved runs")
+    compare.add_argument("baseline", help="JSON results of the earlier run")
+    compare.add_argument("current", help="JSON results of the later run")
+    compare.add_argument("--threshold", type=float, default=0.1, help="allowed slowdown, 0.1 is 10%%")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    if args.command == "e2e":
+        results = run_end_to_end(
+            args.words,
+            [_parse_size(size) for size in args.sizes],
+            args.puzzles,
+            latency=args.latency,
+            failure_rate=args.failure_rate,
+            seed=args.seed,
+        )
+        _print_end_to_end(results)
+    elif args.command == "model":
+        results = run_model([_parse_size(size) for size in args.sizes], repeat=args.repeat, seed=args.seed)
+        _print_model(results)
+    else:
+        comparisons = compare_results(_load_results(args.baseline), _load_results(args.current), args.threshold)
+        _print_comparison(comparisons)
+        # A non-zero exit lets CI fail on regressions
+        sys.exit(1 if any(row["regression"] for row in comparisons) else 0)
+
+    if args.output:
+        _save_results(args.output, args.command, args, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+import logging
+import random
+
+from . import metrics
+from .model import Crossword, Direction, Word
+
+logger = logging.getLogger(__name__)
+
+# Share of black squares aimed for by default, close to published 15x15 and 21x21 grids
+BLOCK_RATIO = 0.17
+# Words per cell required by default, 140 words in a 21x21 grid and 71 in a 15x15 one
+MIN_SLOT_RATIO = 0.3175
+MIN_WORD_LENGTH = 3
+# Blocks that split a run into two words are this much likelier to be tried per run they
+# split, which spreads them out and gives the word counts of published grids
+SPLIT_WEIGHT = 4
+
+
+def _run_length(mask: list[list[bool]], x: int, y: int, dx: int, dy: int) -> int:
+    """Number of white cells from (x, y) onwards in direction (dx, dy), stopping at a block or the edge."""
+    height, width = len(mask), len(mask[0])
+    length = 0
+    while 0 <= x < width and 0 <= y < height and not mask[y][x]:
+        length += 1
+        x += dx
+        y += dy
+    return length
+
+
+def _runs_ok(mask: list[list[bool]], x: int, y: int, min_length: int) -> bool:
+    """Whether the white runs on the four sides of a block at (x, y) are empty or long enough."""
+    for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+        length = _run_length(mask, x + dx, y + dy, dx, dy)
+        if 0 < length < min_length:
+            return False
+    return True
+
+
+def _connected(mask: list[list[bool]], white: int) -> bool:
+    """Whether all `white` white cells of the mask form one orthogonally connected region."""
+    height, width = len(mask), len(mask[0])
+    start = next(((x, y) for y in range(height) for x in range(width) if not mask[y][x]), None)
+    if start is None:
+        return white == 0
+    seen = {start}
+    stack = [start]
+    while stack:
+        x, y = stack.pop()
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if 0 <= nx < width and 0 <= ny < height and not mask[ny][nx] and (nx, ny) not in seen:
+                seen.add((nx, ny))
+                stack.append((nx, ny))
+    return len(seen) == white
+
+
+def _split_weights(mask: list[list[bool]], min_length: int) -> list[list[int]]:
+    """
+    Sampling weight of a block at every white cell: SPLIT_WEIGHT to the power of the
+    number of runs (across and down) it would split into two valid words.
+    """
+    height, width = len(mask), len(mask[0])
+    # White cells before and after every cell along its row, then along its column
+    before_x = [[0] * width for _ in range(height)]
+    after_x = [[0] * width for _ in range(height)]
+    before_y = [[0] * width for _ in range(height)]
+    after_y = [[0] * width for _ in range(height)]
+    for y in range(height):
+        run = 0
+        for x in range(width):
+            before_x[y][x] = run
+            run = 0 if mask[y][x] else run + 1
+        run = 0
+        for x in reversed(range(width)):
+            after_x[y][x] = run
+            run = 0 if mask[y][x] else run + 1
+    for x in range(width):
+        run = 0
+        for y in range(height):
+            before_y[y][x] = run
+            run = 0 if mask[y][x] else run + 1
+        run = 0
+        for y in reversed(range(height)):
+            after_y[y][x] = run
+            run = 0 if mask[y][x] else run + 1
+
+    weights = [[0] * width for _ in range(height)]
+    for y in range(height):
+        for x in range(width):
+            if not mask[y][x]:
+                splits = (min(before_x[y][x], after_x[y][x]) >= min_length) + (
+                    min(before_y[y][x], after_y[y][x]) >= min_length
+                )
+                weights[y][x] = SPLIT_WEIGHT ** splits
+    return weights
+
+
+def _place_blocks(width: int, height: int, blocks: int, min_length: int, rng: random.Random) -> list[list[bool]] | None:
+    """One randomized pass adding symmetric block pairs; None if it ends short of `blocks`."""
+    mask = [[False] * width for _ in range(height)]
+    white = width * height
+    # One cell of every symmetric pair, the centre cell of an odd grid pairs with itself
+    candidates = [
+        (x, y) for y in range(height) for x in range(width)
+        if (y, x) <= (height - 1 - y, width - 1 - x)
+    ]
+    weights = _split_weights(mask, min_length)
+    placed = 0
+    while placed < blocks and candidates:
+        index = rng.choices(range(len(candidates)), weights=[weights[y][x] for x, y in candidates])[0]
+        x, y = candidates.pop(index)
+        pair = {(x, y), (width - 1 - x, height - 1 - y)}
+        if placed + len(pair) > blocks:
+            continue
+        for cx, cy in pair:
+            mask[cy][cx] = True
+        # Cheap local run checks first, the flood fill only for pairs that pass them
+        if all(_runs_ok(mask, cx, cy, min_length) for cx, cy in pair) and _connected(mask, white - len(pair)):
+            placed += len(pair)
+            white -= len(pair)
+            weights = _split_weights(mask, min_length)
+        else:
+            for cx, cy in pair:
+                mask[cy][cx] = False
+    return mask if placed == blocks else None
+
+
+def generate_blocked_mask(
+    width: int = 15,
+    height: int = 15,
+    blocks: int | None = None,
+    min_length: int = MIN_WORD_LENGTH,
+    rng: random.Random | None = None,
+    max_attempts: int = 100,
+    min_slots: int | None = None,
+) -> list[list[bool]]:
+    """
+    Generate a block mask, indexed [y][x] with True for black squares, for a dense
+    American-style grid.
+
+    Black squares come in pairs under 180 degree rotation, every white run across and
+    down is at least min_length cells long and the white cells are connected. Pairs are
+    sampled favouring cells that split runs into two words (see SPLIT_WEIGHT) and kept
+    only if the runs next to them stay long enough and the grid stays connected; a pass
+    that cannot reach `blocks` black squares (by default BLOCK_RATIO of the grid), or
+    whose grid has fewer than min_slots words (by default MIN_SLOT_RATIO of the cells,
+    0 for any number), is restarted, raising ValueError after max_attempts.
+    """
+    if min(width, height) < min_length:
+        raise ValueError(f"A {width}x{height} grid cannot hold words of {min_length} letters")
+    rng = rng or random.Random()
+    if blocks is None:
+        blocks = round(width * height * BLOCK_RATIO)
+        # An odd number of blocks needs the centre cell, which only an odd-sized grid has
+        if blocks % 2 and not (width % 2 and height % 2):
+            blocks -= 1
+    if min_slots is None:
+        min_slots = round(width * height * MIN_SLOT_RATIO)
+
+    for attempt in range(1, max_attempts + 1):
+        mask = _place_blocks(width, height, blocks, min_length, rng)
+        if mask is not None and (not min_slots or len(slots_from_mask(mask)) >= min_slots):
+            metrics.increment("blocked.attempts", attempt)
+            return mask
+    metrics.increment("blocked.attempts", max_attempts)
+    raise ValueError(
+        f"Could not place {blocks} blocks in a {width}x{height} grid"
+        + (f" with {min_slots} slots" if min_slots else "")
+        + f" in {max_attempts} attempts"
+    )
+
+
+def slots_from_mask(mask: list[list[bool]]) -> list[Word]:
+    """Return a blank Word for every white run of two or more cells, across runs first, in reading order."""
+    height, width = len(mask), len(mask[0])
+    slots = []
+    for direction, dx, dy in ((Direction.ACROSS, 1, 0), (Direction.DOWN, 0, 1)):
+        for y in range(height):
+            for x in range(width):
+                if mask[y][x]:
+                    continue
+                # A slot starts at a white cell after a block or the edge
+                px, py = x - dx, y - dy
+                if 0 <= px < width and 0 <= py < height and not mask[py][px]:
+                    continue
+                length = _run_length(mask, x, y, dx, dy)
+                if length >= 2:
+                    slots.append(Word(" " * length, x, y, direction))
+    return slots
+
+
+def build_blocked_crossword(
+    width: int = 15,
+    height: int = 15,
+    blocks: int | None = None,
+    min_length: int = MIN_WORD_LENGTH,
+    rng: random.Random | None = None,
+    min_slots: int | None = None,
+) -> Crossword:
+    """Generate a symmetric blocked grid and return it as a Crossword of blank slots, ready to fill."""
+    with metrics.timer("blocked.duration"):
+        mask = generate_blocked_mask(width, height, blocks, min_length, rng, min_slots=min_slots)
+        crossword = Crossword(width, height)
+        for slot in slots_from_mask(mask):
+            # Slots of a dense grid touch their neighbours everywhere, which add_word's
+            # rules for free-form layouts forbid
+            crossword.add_slot(slot)
+    metrics.increment("blocked.slots", len(crossword.words))
+    logger.debug("Blocked %dx%d grid with %d slots", width, height, len(crossword.words))
+    return crossword
+
@@ -0,0 +1,95 @@
+import sqlite3
+import threading
+import time
+from typing import Iterable
+
+# Share of max_entries evicted below the limit once it is exceeded, so a full cache
+# recounts its table once per batch of inserts rather than on every insert
+EVICT_FRACTION = 0.01
+
+
+class WordCache:
+    """
+    On-disk cache of generated words and clues, keyed by theme, language and length.
+
+    A lookup takes a letter pattern like '_A__E' and returns any cached word of the
+    same theme, language and length that fits it, including words generated for a
+    less constrained pattern. Entries are evicted least recently used first once
+    the cache holds more than max_entries words. Rows are counted when the cache
+    opens and then kept as a running count, which only goes back to the table,
+    where other processes may have added rows, when it passes max_entries.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS words (
+                theme TEXT NOT NULL,
+                language TEXT NOT NULL,
+                length INTEGER NOT NULL,
+                word TEXT NOT NULL,
+                clue TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (theme, language, word)
+            );
+            CREATE INDEX IF NOT EXISTS words_by_slot ON words (theme, language, length);
+            CREATE INDEX IF NOT EXISTS words_by_use ON words (last_used);
+        """)
+        self._count = self._connection.execute("SELECT COUNT(*) FROM words").fetchone()[0]
+
+    @staticmethod
+    def _key(theme: str, language: str) -> tuple[str, str]:
+        return theme.strip().lower(), language.strip().lower()
+
+    def get(self, theme: str, language: str, pattern: str, exclude: Iterable[str] = ()) -> tuple[str, str] | None:
+        """Return a cached (word, clue) matching the pattern, where '_' is any letter."""
+        theme, language = self._key(theme, language)
+        exclude = [word.upper() for word in exclude]
+        # LIKE already treats '_' as any single character; escape '%' and '\\' in fixed letters
+        like = pattern.upper().replace("\\", "\\\\").replace("%", "\\%")
+        query = (
+            "SELECT word, clue FROM words WHERE theme = ? AND language = ? AND length = ?"
+            " AND word LIKE ? ESCAPE '\\'"
+        )
+        if exclude:
+            query += f" AND word NOT IN ({', '.join('?' * len(exclude))})"
+        query += " ORDER BY RANDOM() LIMIT 1"
+
+        with self._lock:
+            row = self._connection.execute(
+                query, (theme, language, len(pattern), like, *exclude)
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE words SET last_used = ? WHERE theme = ? AND language = ? AND word = ?",
+                (time.time(), theme, language, row[0]),
+            )
+            self._connection.commit()
+        return row
+
+    def put(self, theme: str, language: str, word: str, clue: str) -> None:
+        """Store a generated word, evicting the least recently used entries if the cache is full."""
+        theme, language = self._key(theme, language)
+        word = word.upper()
+        with self._lock:
+            cursor = self._connection.execute(
+                "INSERT OR IGNORE INTO words VALUES (?, ?, ?, ?, ?, ?)",
+                (theme, language, len(word), word, clue, time.time()),
+            )
+            if cursor.rowcount:
+                self._count += 1
+                if self._count > self.max_entries:
+                    # Counted from the table, as other processes may share the file
+                    count = self._connection.execute("SELECT COUNT(*) FROM words").fetchone()[0]
+                    excess = count - self.max_entries
+                    if excess > 0:
+                        excess += int(self.max_entries * EVICT_FRACTION)
+                        self._connection.execute(
+                            "DELETE FROM words WHERE rowid IN (SELECT rowid FROM words ORDER BY last_used LIMIT ?)",
+                            (excess,),
+                        )
+                    self._count = count - max(excess, 0)
+            self._connection.commit()
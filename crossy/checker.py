@@ -0,0 +1,70 @@
+from .model import Crossword
+
+
+class AnswerChecker:
+    """
+    Incremental check of a player's letters against a filled crossword.
+
+    Keeps the number of correct letters per word and in total, and the set of
+    filled-in wrong cells. set_letter updates them through the crossword's
+    cell -> words index in O(words through the cell), so checking a word, checking
+    the puzzle or asking whether it is solved never rescans the grid. Cells whose
+    solution is still blank can never be correct.
+    """
+
+    def __init__(self, crossword: Crossword):
+        self.solution: dict[tuple[int, int], str] = {
+            coord: letter.upper() for coord, letter in crossword.cells().items()
+        }
+        self.cell_words: dict[tuple[int, int], list[int]] = {
+            coord: [word_index for word_index, _ in entries] for coord, entries in crossword.cell_words().items()
+        }
+        self.word_lengths = [len(word.word) for word in crossword.words]
+        self.word_correct = [0] * len(crossword.words)
+        self.entries: dict[tuple[int, int], str] = {}
+        self.wrong: set[tuple[int, int]] = set()
+        self.correct_cells = 0
+        self.solved_words = 0
+
+    def set_letter(self, x: int, y: int, letter: str) -> None:
+        """Record the letter typed in a cell; an empty letter clears it."""
+        coord = (x, y)
+        solution = self.solution.get(coord)
+        if solution is None:
+            return
+        letter = letter.upper()
+        was_correct = self.entries.get(coord) == solution != " "
+        if letter:
+            self.entries[coord] = letter
+        else:
+            self.entries.pop(coord, None)
+        is_correct = letter == solution != " "
+
+        if letter and not is_correct:
+            self.wrong.add(coord)
+        else:
+            self.wrong.discard(coord)
+
+        if was_correct == is_correct:
+            return
+        change = 1 if is_correct else -1
+        self.correct_cells += change
+        for word_index in self.cell_words[coord]:
+            was_solved = self.word_correct[word_index] == self.word_lengths[word_index]
+            self.word_correct[word_index] += change
+            self.solved_words += (self.word_correct[word_index] == self.word_lengths[word_index]) - was_solved
+
+    def word_progress(self, word_index: int) -> tuple[int, int]:
+        """Return (correct letters, length) of a word."""
+        return self.word_correct[word_index], self.word_lengths[word_index]
+
+    def is_word_correct(self, word_index: int) -> bool:
+        return self.word_correct[word_index] == self.word_lengths[word_index]
+
+    def words_at(self, x: int, y: int) -> list[int]:
+        """Indices of the words crossing a cell."""
+        return self.cell_words.get((x, y), [])
+
+    def is_solved(self) -> bool:
+        """A crossword without cells has nothing to solve and is never solved."""
+        return bool(self.solution) and self.correct_cells == len(self.solution)
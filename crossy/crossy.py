@@ -1,11 +1,52 @@
 """Welcome to Reflex! This file outlines the steps to create a basic app."""
 
+import logging
+import os
+
 import reflex as rx
 from rxconfig import config
-from .generate import generate_word, LetterConstraint
+from . import metrics
+from .generate import LetterConstraint
 
-from .model import Crossword, Word, Direction, generate_word_pattern
+from .model import Clue, Crossword, Word, Direction
+from .pipeline import build_crossword_layout, fill_crossword_words
 from .agent import build_crossword_puzzle
+from .bank import PuzzleBank
+from .checker import AnswerChecker
+from .pool import PuzzlePool
+
+logger = logging.getLogger(__name__)
+
+# Puzzle settings, shared by the handlers and the puzzle pool
+THEME = "Food"
+LANGUAGE = "English"
+WIDTH = 20
+HEIGHT = 5
+NUM_WORDS = 2
+
+# Optional file of stored puzzles, served when the pool is empty and grown by it
+PUZZLE_BANK_PATH = os.environ.get("CROSSY_PUZZLE_BANK", "")
+puzzle_bank = PuzzleBank(PUZZLE_BANK_PATH) if PUZZLE_BANK_PATH else None
+
+# Finished puzzles generated in the background, so a new grid does not wait for the LLM.
+# Enabled with CROSSY_POOL_SIZE; its workers start with the server or on the first grid,
+# never on import, so compiling the app or importing it in a benchmark calls no LLM
+puzzle_pool = PuzzlePool(bank=puzzle_bank)
+
+
+def configure_logging():
+    """
+    Log at CROSSY_LOG_LEVEL when the server starts. Done here rather than on import,
+    so importing the app, e.g. in a benchmark or a test, leaves logging alone.
+    """
+    logging.basicConfig(level=os.environ.get("CROSSY_LOG_LEVEL", "INFO"))
+
+
+def warm_puzzle_pool():
+    """Start filling the puzzle pool when the server starts."""
+    puzzle_pool.warm(THEME, LANGUAGE, WIDTH, HEIGHT, NUM_WORDS)
+
+
 class Cell(rx.Base):
     letter: str
     number: int
@@ -16,119 +57,203 @@ class Cell(rx.Base):
 class Row(rx.Base):
     row: list[Cell]
 
-            
+
+def crossword_to_rows(crossword: Crossword) -> list[Row]:
+    """Convert a crossword layout to empty, numbered Row/Cell models for the grid UI."""
+    layout = crossword.get_layout()
+    return [
+        Row(row=[
+            Cell(
+                letter=" ",  # Always initialize with space
+                number=layout.numbers[y][x],
+                is_black=layout.is_black[y][x],
+                pos_x=x,
+                pos_y=y,
+            )
+            for x in range(crossword.width)
+        ])
+        for y in range(crossword.height)
+    ]
+
 class State(rx.State):
+    # Layout of the grid and the letters its inputs start with; typed letters are not written back
     rows: list[Row] = []
     crossword: Crossword = None
+    # Bumped to remount the grid inputs when their starting letters change
+    grid_version: int = 0
+    # Letters typed by the player keyed by "x,y"; a backend var, so keystrokes send no state back
+    _entries: dict[str, str] = {}
+    across_clues: list[Clue] = []
+    down_clues: list[Clue] = []
+    # Correctness counters for _entries, built on the first keystroke after the solution is known
+    _checker: AnswerChecker | None = None
+    # "x,y" of the last cell typed in, the cell "Check Word" checks the words of
+    _last_cell: str = ""
+    solved: bool = False
+    check_message: str = ""
+
+    def _set_clues(self):
+        layout = self.crossword.get_layout()
+        self.across_clues = layout.across
+        self.down_clues = layout.down
+
+    def _reset_checker(self):
+        self._checker = None
+        self.solved = False
+        self.check_message = ""
+
+    def _get_checker(self) -> AnswerChecker:
+        if self._checker is None:
+            self._checker = AnswerChecker(self.crossword)
+            for key, letter in self._entries.items():
+                x, y = key.split(",")
+                self._checker.set_letter(int(x), int(y), letter)
+        return self._checker
     
+    # Reflex reads handler arguments from the function itself, so handlers are
+    # timed with a block instead of the metrics.timed decorator
     def create_crossword(self):
-        print("Creating a new crossword puzzle")
-        #build_crossword_puzzle("Pizza", 10, 10)
-        language = "English"
-        theme = "Food"
-        for word in self.crossword.words:
-            print(word)
-            print(f"length: {len(word.word)}")
-            letter_constraints = self.crossword.get_letter_constraints_for_word(word)
-            print(f"Letter constraints: {letter_constraints}")
-            length = len(word.word)
-            
-            generated_word = generate_word(theme, language, length, letter_constraints)
-            print(f"Result: {generated_word.word}")
-            print(f"Clue: {generated_word.clue}")
-            word.word = generated_word.word
-            word.clue = generated_word.clue
-        self.crossword.print_crossword()
+        with metrics.timer("handler.create_crossword"):
+            logger.info("Creating a new crossword puzzle")
+            #build_crossword_puzzle("Pizza", 10, 10)
+            if not self.crossword:
+                return
+            # Puzzles from the pool are already filled
+            if any(' ' in word.word for word in self.crossword.words):
+                fill_crossword_words(self.crossword, THEME, LANGUAGE)
+            self._set_clues()
+            self._reset_checker()
+            # Rendering the grid is not free, only do it when it will be logged
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Crossword:\n%s", self.crossword.get_crossword_string())
             
             
             
     
     def initialize_grid(self):
-        print("initialize_grid")
-        width = 20
-        height = 5
-        num_words = 2
-        crossword = Crossword(width,height)
-        try:
-            print("Generating word pattern")
-            word_pattern = generate_word_pattern(width, height, num_words)
-            print(f"Word pattern: {word_pattern}")
-            for word in word_pattern:
-                # Replace dashes with spaces in the word pattern
-                word.word = word.word.replace("-", " ")
-                crossword.add_word(word)
-            self.crossword = crossword
-
-            # Convert crossword grid to our Row/Cell format
-            grid = crossword._initialize_grid()
-            grid = crossword._fill_grid_with_words(grid)
-            
-            # Convert to Reflex Row/Cell format
-            new_rows = []
-            for y, row in enumerate(grid):
-                cells = []
-                for x, letter in enumerate(row):
-                    # Change the logic here - only consider it black if it's outside the word pattern
-                    is_black = True
-                    for word in crossword.words:
-                        if any((x, y) == coord for coord in crossword._get_word_coordinates(word)):
-                            is_black = False
-                            break
-                        
-                    cells.append(Cell(
-                        letter=" ",  # Always initialize with space
-                        number=0,
-                        is_black=is_black,
-                        pos_x=x,
-                        pos_y=y
-                    ))
-                new_rows.append(Row(row=cells))
-            
-            self.rows = new_rows
-            
-        except ValueError as e:
-            print(f"Error creating crossword: {e}")
+        with metrics.timer("handler.initialize_grid"):
+            logger.debug("initialize_grid")
+            try:
+                crossword = puzzle_pool.get(THEME, LANGUAGE, WIDTH, HEIGHT, NUM_WORDS)
+                if crossword is None and puzzle_bank is not None:
+                    crossword = puzzle_bank.find(THEME, LANGUAGE, WIDTH, HEIGHT)
+                if crossword is None:
+                    # Pool is empty, only build the layout now and fill it in create_crossword
+                    crossword = build_crossword_layout(WIDTH, HEIGHT, NUM_WORDS)
+                self.crossword = crossword
+
+                self.rows = crossword_to_rows(crossword)
+                self._set_clues()
+                self._entries = {}
+                self._reset_checker()
+                self.grid_version += 1
+                
+            except ValueError as e:
+                logger.error("Error creating crossword: %s", e)
 
     def set_cell_letter(self, pos_x: int, pos_y: int, letter: str):
-        print(f"set_cell_letter: {pos_x}, {pos_y}, {letter}")
-        if len(letter) > 1:
-            print("too long")
-            letter = letter[0]
-        self.rows[pos_y].row[pos_x].letter = letter
+        with metrics.timer("handler.set_cell_letter"):
+            logger.debug("set_cell_letter: %d, %d, %s", pos_x, pos_y, letter)
+            if len(letter) > 1:
+                letter = letter[0]
+            # Only backend vars change, the input already shows the letter; solved is
+            # only sent when it flips
+            if letter:
+                self._entries[f"{pos_x},{pos_y}"] = letter
+            else:
+                self._entries.pop(f"{pos_x},{pos_y}", None)
+            self._last_cell = f"{pos_x},{pos_y}"
+            if not self.crossword:
+                return
+            checker = self._get_checker()
+            checker.set_letter(pos_x, pos_y, letter)
+            if checker.is_solved() != self.solved:
+                self.solved = checker.is_solved()
+
+    def check_word(self):
+        """Report how many letters of the words through the last typed cell are correct."""
+        with metrics.timer("handler.check_word"):
+            if not self.crossword or not self._last_cell:
+                self.check_message = "Type in a word to check it"
+                return
+            checker = self._get_checker()
+            numbers = self.crossword.get_layout().numbers
+            x, y = (int(value) for value in self._last_cell.split(","))
+            reports = []
+            for word_index in checker.words_at(x, y):
+                word = self.crossword.words[word_index]
+                correct, length = checker.word_progress(word_index)
+                reports.append(
+                    f"{numbers[word.pos_y][word.pos_x]} {word.direction.title()}: {correct}/{length} letters correct"
+                )
+            self.check_message = "; ".join(reports)
+
+    def check_puzzle(self):
+        """Report correct and wrong letters and solved words for the whole puzzle."""
+        with metrics.timer("handler.check_puzzle"):
+            if not self.crossword:
+                return
+            checker = self._get_checker()
+            self.check_message = (
+                f"{checker.correct_cells}/{len(checker.solution)} letters correct, {len(checker.wrong)} wrong, "
+                f"{checker.solved_words}/{len(checker.word_lengths)} words solved"
+            )
 
     def reveal_solution(self):
         """Reveal the solution by filling in all letters from the crossword."""
-        if not self.crossword:
-            return
+        with metrics.timer("handler.reveal_solution"):
+            if not self.crossword:
+                return
+                
+            # Get the filled grid from crossword
+            grid = self.crossword.get_grid()
+            is_black = self.crossword.get_layout().is_black
             
-        # Get the filled grid from crossword
-        grid = self.crossword._initialize_grid()
-        grid = self.crossword._fill_grid_with_words(grid)
-        
-        # Update each cell in our rows with the solution
-        for y, row in enumerate(grid):
-            for x, letter in enumerate(row):
-                if not self.rows[y].row[x].is_black:
-                    self.rows[y].row[x].letter = letter
+            # Update each cell in our rows with the solution
+            for y, row in enumerate(grid):
+                for x, letter in enumerate(row):
+                    if not is_black[y][x]:
+                        self.rows[y].row[x].letter = letter
+                        self._entries[f"{x},{y}"] = letter
+            self._reset_checker()
+            self.grid_version += 1
 
 def show_cell(cell: Cell) -> rx.Component:
     return rx.table.cell(
         rx.cond(
             cell.is_black,
             rx.text(" "),
-            rx.input(
-                value=cell.letter, 
-                on_change=State.set_cell_letter(cell.pos_x, cell.pos_y),
-                width="80px",
-                height="80px",
-                padding="0",
-                margin="0",
-                text_align="center",
-                display="flex",
-                align_items="center",
-                justify_content="center",
-                font_size="24px",
-                
+            rx.box(
+                rx.cond(
+                    cell.number > 0,
+                    rx.text(
+                        cell.number,
+                        position="absolute",
+                        top="2px",
+                        left="4px",
+                        font_size="12px",
+                        z_index="1",
+                        pointer_events="none",
+                    ),
+                ),
+                # Uncontrolled input: it keeps the typed letter itself, so set_cell_letter
+                # does not have to send the grid back on every keystroke
+                rx.input(
+                    default_value=cell.letter,
+                    max_length=1,
+                    on_change=State.set_cell_letter(cell.pos_x, cell.pos_y),
+                    width="80px",
+                    height="80px",
+                    padding="0",
+                    margin="0",
+                    text_align="center",
+                    display="flex",
+                    align_items="center",
+                    justify_content="center",
+                    font_size="24px",
+                    
+                ),
+                position="relative",
             )
         ),
         padding="0",
@@ -146,6 +271,16 @@ def show_row(row: Row) -> rx.Component:
         
     )
 
+def show_clue(clue: Clue) -> rx.Component:
+    return rx.text(f"{clue.number}. {clue.clue} ({clue.length})")
+
+def show_clues() -> rx.Component:
+    return rx.hstack(
+        rx.vstack(rx.heading("Across", size="4"), rx.foreach(State.across_clues, show_clue)),
+        rx.vstack(rx.heading("Down", size="4"), rx.foreach(State.down_clues, show_clue)),
+        spacing="9",
+    )
+
 def index() -> rx.Component:
     # Welcome Page (Index)
     return rx.container(
@@ -153,9 +288,17 @@ def index() -> rx.Component:
             rx.button("Initialize Grid", on_click=State.initialize_grid),
             rx.button("Create Crossword", on_click=State.create_crossword),
             rx.button("Reveal Solution", on_click=State.reveal_solution),
+            rx.hstack(
+                rx.button("Check Word", on_click=State.check_word),
+                rx.button("Check Puzzle", on_click=State.check_puzzle),
+            ),
+            rx.text(State.check_message),
+            rx.cond(State.solved, rx.heading("Puzzle solved!", size="5")),
             rx.table.root(
                 rx.table.body(
                     rx.foreach(State.rows, show_row),
+                    # A new key remounts the inputs with their new starting letters
+                    key=State.grid_version,
                     spacing="0",
                     width="100%",
                 ),
@@ -167,6 +310,7 @@ def index() -> rx.Component:
                 
                 
             ),
+            show_clues(),
             align="center",
         ),
         center_content=True,
@@ -177,4 +321,6 @@ def index() -> rx.Component:
 
 app = rx.App()
 app.add_page(index)
+app.register_lifespan_task(configure_logging)
+app.register_lifespan_task(warm_puzzle_pool)
 # --table-row-box-shadow: inset 0 -1px var(--gray-a5); Need to find a way of disabling this
\ No newline at end of file
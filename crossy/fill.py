@@ -0,0 +1,124 @@
+import random
+from typing import Iterable
+
+from . import metrics
+from .lexicon import Lexicon
+from .model import Crossword
+
+
+@metrics.timed("fill.duration")
+def fill_crossword(
+    crossword: Crossword,
+    words: Lexicon | Iterable[str],
+    rng: random.Random | None = None,
+    max_backtracks: int = 10000,
+) -> None:
+    """
+    Fill every open slot of the crossword with words from a Lexicon or word list.
+
+    Uses backtracking search that always picks the slot with the fewest remaining
+    candidates, and forward checking that prunes the candidates of crossing slots
+    after each assignment. Letters already in the grid are kept. The crossword is
+    only modified once a complete fill has been found; otherwise ValueError is raised.
+
+    Candidate sets are Lexicon bitsets, so forward checking a crossing is a single
+    AND with the (position, letter) index and the slot ordering uses popcounts.
+    """
+    lexicon = words if isinstance(words, Lexicon) else Lexicon(words)
+    slots = crossword.words
+    constraints = [crossword.get_letter_constraints_for_word(slot) for slot in slots]
+    patterns = [constraint.pattern for constraint in constraints]
+
+    assignment: list[str | None] = [None] * len(slots)
+    used = set()
+    domains: list[int] = []
+    # Slots placed twice at the same position share one word, fill only the first copy
+    copies: dict[int, int] = {}
+    first_slot: dict[tuple, int] = {}
+    for i, slot in enumerate(slots):
+        key = (slot.pos_x, slot.pos_y, slot.direction, len(slot.word))
+        if key in first_slot:
+            copies[i] = first_slot[key]
+        else:
+            first_slot[key] = i
+
+    for i, pattern in enumerate(patterns):
+        if i in copies:
+            assignment[i] = ""
+            domains.append(0)
+            continue
+        if None not in pattern:
+            # Slot is already complete, keep it as it is
+            assignment[i] = ''.join(pattern)
+            used.add(assignment[i])
+            domains.append(0)
+            continue
+        domain = lexicon.match_bits(constraints[i])
+        if not domain:
+            raise ValueError(f"No word in the word list matches slot {i} pattern '{constraints[i].to_string()}'")
+        domains.append(domain)
+
+    graph = crossword.get_slot_graph()
+    neighbours: list[list[tuple[int, int, int]]] = [
+        [] if i in copies else [edge for edge in edges if edge[1] not in copies]
+        for i, edges in enumerate(graph.edges)
+    ]
+
+    backtracks = 0
+
+    def search() -> bool:
+        nonlocal backtracks
+        open_slots = [i for i, word in enumerate(assignment) if word is None]
+        if not open_slots:
+            return True
+
+        # Most constrained slot first, ties broken by the number of crossings
+        slot = min(open_slots, key=lambda i: (domains[i].bit_count(), -len(neighbours[i])))
+        candidates = lexicon.words_from_bits(len(patterns[slot]), domains[slot])
+        if rng is not None:
+            rng.shuffle(candidates)
+        for candidate in candidates:
+            if candidate in used:
+                continue
+
+            # Forward check: narrow every open crossing slot to words agreeing with the candidate
+            pruned: dict[int, int] = {}
+            consistent = True
+            for letter_index, other, other_letter_index in neighbours[slot]:
+                if assignment[other] is not None:
+                    continue
+                remaining = domains[other] & lexicon.position_bits(
+                    len(patterns[other]), other_letter_index, candidate[letter_index]
+                )
+                if not remaining:
+                    consistent = False
+                    break
+                pruned.setdefault(other, domains[other])
+                domains[other] = remaining
+
+            if consistent:
+                assignment[slot] = candidate
+                used.add(candidate)
+                if search():
+                    return True
+                assignment[slot] = None
+                used.discard(candidate)
+                backtracks += 1
+                if backtracks > max_backtracks:
+                    raise ValueError(f"Gave up filling crossword after {max_backtracks} backtracks")
+
+            for other, domain in pruned.items():
+                domains[other] = domain
+        return False
+
+    try:
+        found = search()
+    finally:
+        # Counted once per fill to keep the search loop free of metric calls
+        metrics.increment("fill.backtracks", backtracks)
+    if not found:
+        raise ValueError("No fill exists for this layout with the given word list")
+
+    for i, (slot, pattern) in enumerate(zip(slots, patterns)):
+        if None in pattern:
+            crossword.update_word(i, assignment[copies.get(i, i)], slot.clue)
@@ -1,13 +1,62 @@
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pydantic import BaseModel
-from openai import OpenAI
-from typing import List
+from typing import Any, Iterable, List, TYPE_CHECKING
+from . import metrics
+from .cache import WordCache
+from .llm import get_client
 
-client = OpenAI()
+if TYPE_CHECKING:
+    from .model import Crossword
+
+# Optional on-disk cache of generated words, shared by all puzzles
+WORD_CACHE_PATH = os.environ.get("CROSSY_WORD_CACHE", "")
+word_cache = WordCache(WORD_CACHE_PATH) if WORD_CACHE_PATH else None
+
+MODEL = "gpt-4o-2024-08-06" #gpt-4o-mini-2024-07-18
+
+logger = logging.getLogger(__name__)
 
 class Word(BaseModel):
     word: str
     clue: str
 
+class WordCandidates(BaseModel):
+    words: List[Word]
+
+class SlotWord(Word):
+    slot: int
+
+class PuzzleWords(BaseModel):
+    words: List[SlotWord]
+
+class WordReservations:
+    """
+    Words taken by slots that are generated concurrently. Slots of one wave all see
+    the same exclusion list, so each chosen word is reserved here first and a slot
+    whose word another slot already took has to pick a different one.
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        self._lock = threading.Lock()
+        self._words = {word.upper() for word in words}
+
+    def reserve(self, word: str) -> bool:
+        """Take a word; False if it is already taken."""
+        word = word.upper()
+        with self._lock:
+            if word in self._words:
+                return False
+            self._words.add(word)
+            return True
+
+    def words(self) -> list[str]:
+        with self._lock:
+            return sorted(self._words)
+
 class LetterConstraint:
     def __init__(self, pattern: List[str | None]):
         """Initialize with a list of letters or None, e.g. [None, 'A', None, 'T', None]"""
@@ -17,6 +66,9 @@ class LetterConstraint:
         """Convert the pattern to a readable string format like '_A_T_'"""
         return ''.join('_' if letter is None else letter for letter in self.pattern)
 
+    def __str__(self) -> str:
+        return self.to_string()
+
     @classmethod
     def from_string(cls, pattern: str) -> 'LetterConstraint':
         """Create from a string like '_A_T_'"""
@@ -47,18 +99,96 @@ Letter pattern: {letter_pattern}
 Additional constraints: {constraints}
 """
 
+CANDIDATES_PROMPT = """
+Return {candidates} different candidate words in the "words" list, best fitting first, each with its own clue.
+Every candidate must satisfy all of the rules above.
+"""
+
+def _validate_word(
+    word: Word,
+    word_length: int,
+    letter_constraints: LetterConstraint | None,
+    exclude_words: List[str] | None = None,
+) -> None:
+    """Raise ValueError if a generated word does not fit the slot."""
+    # Validate word length
+    if len(word.word) != word_length:
+        raise ValueError(f"Generated word '{word.word}' length ({len(word.word)}) does not match required length ({word_length})")
+
+    # Validate letter constraints if they exist
+    if letter_constraints:
+        for i, (constraint, letter) in enumerate(zip(letter_constraints.pattern, word.word)):
+            if constraint is not None and constraint.lower() != letter.lower():
+                raise ValueError(f"Generated word '{word.word}' violates letter constraint at position {i}: expected '{constraint}', got '{letter}'")
+
+    # A fully constrained slot can only take one word, so exclusions do not apply to it
+    fully_constrained = letter_constraints is not None and None not in letter_constraints.pattern
+    if exclude_words and not fully_constrained and word.word.upper() in {excluded.upper() for excluded in exclude_words}:
+        raise ValueError(f"Generated word '{word.word}' is already used in the puzzle")
+
+def _complete(messages: list[dict], response_format: type) -> Any:
+    """Send one structured chat request and record call, token and latency metrics."""
+    with metrics.timer("llm.duration"):
+        completion = get_client().beta.chat.completions.parse(
+            model=MODEL,
+            messages=messages,
+            response_format=response_format,
+        )
+    metrics.increment("llm.calls")
+    usage = getattr(completion, "usage", None)
+    if usage is not None:
+        metrics.increment("llm.prompt_tokens", usage.prompt_tokens)
+        metrics.increment("llm.completion_tokens", usage.completion_tokens)
+    return completion.choices[0].message.parsed
+
 def generate_word(
     theme: str,
     language: str,
     word_length: int,
     letter_constraints: LetterConstraint | None = None,
-    additional_constraints: str = ""
+    additional_constraints: str = "",
+    exclude_words: List[str] | None = None,
+    candidates: int = 1,
+    reserved: WordReservations | None = None,
 ) -> Word:
-    print(f"Generating word for theme: {theme}, language: {language}, word length: {word_length}, letter constraints: {letter_constraints}, additional constraints: {additional_constraints}")
+    """
+    Generate a word and clue for one slot.
+
+    With candidates > 1 a single request asks for a ranked list of that many words,
+    which are all checked locally; the first valid one is returned and every valid
+    one is cached, so most retries for tightly constrained slots disappear. With
+    reservations, the returned word is reserved and words already reserved are avoided.
+    """
+    logger.debug(
+        "Generating word for theme: %s, language: %s, word length: %s, letter constraints: %s, additional constraints: %s",
+        theme, language, word_length, letter_constraints, additional_constraints,
+    )
     if letter_constraints is None:
         letter_pattern = '_' * word_length
     else:
         letter_pattern = letter_constraints.to_string()
+    # A fully constrained slot can only take one word, so it never competes for it
+    fully_constrained = letter_constraints is not None and None not in letter_constraints.pattern
+
+    def reserve(word: str) -> bool:
+        return reserved is None or fully_constrained or reserved.reserve(word)
+
+    if reserved is not None:
+        exclude_words = sorted({*(exclude_words or []), *reserved.words()})
+
+    # Any cached word for this theme that fits the pattern saves the round trip
+    if word_cache is not None and not additional_constraints:
+        skipped = list(exclude_words or [])
+        cached = word_cache.get(theme, language, letter_pattern, skipped)
+        # Another slot of the wave may have reserved the word since the exclusions were read
+        while cached is not None and not reserve(cached[0]):
+            skipped.append(cached[0])
+            cached = word_cache.get(theme, language, letter_pattern, skipped)
+        if cached is not None:
+            metrics.increment("word_cache.hits")
+            logger.debug("Cache hit for pattern %s: %s", letter_pattern, cached[0])
+            return Word(word=cached[0], clue=cached[1])
+        metrics.increment("word_cache.misses")
         
     formatted_prompt = USER_PROMPT.format(
         theme=theme,
@@ -67,48 +197,224 @@ def generate_word(
         letter_pattern=letter_pattern,
         constraints=additional_constraints
     )
-    
     last_error = None
     max_attempts = 6
     
     for attempt in range(max_attempts):
         try:
+            if reserved is not None and attempt:
+                # Words reserved by other slots since the last attempt are excluded too
+                exclude_words = sorted({*exclude_words, *reserved.words()})
+            user_prompt = formatted_prompt
+            if exclude_words:
+                user_prompt += f"Do not use any of these words: {', '.join(exclude_words)}\n"
+            if candidates > 1:
+                user_prompt += CANDIDATES_PROMPT.format(candidates=candidates)
             messages = [
                 {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": formatted_prompt},
+                {"role": "user", "content": user_prompt},
             ]
             
             # Add error feedback from previous attempt if it exists
             if last_error:
+                metrics.increment("llm.retries")
                 messages.append({
                     "role": "user",
                     "content": f"Previous attempt failed with error: {last_error}. Please try again with a valid word."
                 })
             
-            completion = client.beta.chat.completions.parse(
-                model="gpt-4o-2024-08-06", #gpt-4o-mini-2024-07-18
-                messages=messages,
-                response_format=Word,
-            )
-            word = completion.choices[0].message.parsed
-
-            # Validate word length
-            if len(word.word) != word_length:
-                raise ValueError(f"Generated word '{word.word}' length ({len(word.word)}) does not match required length ({word_length})")
+            parsed = _complete(messages, WordCandidates if candidates > 1 else Word)
+            options = parsed.words if candidates > 1 else [parsed]
 
-            # Validate letter constraints if they exist
-            if letter_constraints:
-                for i, (constraint, letter) in enumerate(zip(letter_constraints.pattern, word.word)):
-                    if constraint is not None and constraint.lower() != letter.lower():
-                        raise ValueError(f"Generated word '{word.word}' violates letter constraint at position {i}: expected '{constraint}', got '{letter}'")
+            valid_words = []
+            errors = []
+            for option in options:
+                try:
+                    _validate_word(option, word_length, letter_constraints, exclude_words)
+                    valid_words.append(option)
+                except ValueError as e:
+                    errors.append(str(e))
+            if not valid_words:
+                raise ValueError("; ".join(errors) or "No candidate words returned")
 
-            return word
+            if word_cache is not None:
+                for valid_word in valid_words:
+                    word_cache.put(theme, language, valid_word.word, valid_word.clue)
+            chosen = next((valid_word for valid_word in valid_words if reserve(valid_word.word)), None)
+            if chosen is None:
+                raise ValueError(
+                    f"Generated words {', '.join(word.word for word in valid_words)} are already used in the puzzle"
+                )
+            return chosen
             
         except ValueError as e:
             last_error = str(e)
             if attempt == max_attempts - 1:
                 raise ValueError(f"Failed to generate valid word after {max_attempts} attempts. Last error: {last_error}")
 
+def generate_words(
+    theme: str,
+    language: str,
+    slots: List[tuple[int, LetterConstraint | None]],
+    max_workers: int = 8,
+    exclude_words: List[str] | None = None,
+    candidates: int = 1,
+) -> List[Word]:
+    """
+    Generate words for independent (length, letter constraints) slots concurrently,
+    never giving two slots the same word.
+    """
+    reserved = WordReservations(exclude_words or [])
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                generate_word, theme, language, length, letter_constraints, "", exclude_words, candidates, reserved
+            )
+            for length, letter_constraints in slots
+        ]
+        return [future.result() for future in futures]
+
+PUZZLE_SYSTEM_PROMPT = """
+You are a crossword puzzle expert generator.
+You are given a topic and the full slot layout of a crossword puzzle as JSON.
+You will fill every slot with a fitting word and write a clue for it.
+
+Each slot has an id, a direction, a length, a letter pattern where '_' means any letter,
+and a list of crossings. A crossing {"position": i, "slot": s, "slot_position": j} means
+letter i of this slot is the same cell as letter j of slot s, so both words MUST have
+the same letter there.
+
+You will return a JSON object with a "words" list holding one entry per slot id.
+*The clue must be super short
+*Each word should be a single word and not a phrase.
+*The words and clues should be in the language provided.
+*Each word MUST have the length of its slot and match its letter pattern.
+*Each word MUST agree with every crossing.
+*Each word MUST be a real COMMON word in the language provided.
+*Do not use the same word twice.
+
+"""
+
+PUZZLE_USER_PROMPT = """
+Theme: {theme}
+Language: {language}
+Slots:
+{slots}
+"""
+
+def generate_puzzle_words(
+    crossword: "Crossword",
+    theme: str,
+    language: str,
+    max_rounds: int = 2,
+) -> List[int]:
+    """
+    Fill the open slots of a crossword with one structured request for the whole layout.
+
+    Answers are validated locally: a slot is accepted if it fits its pattern and agrees
+    with every crossing slot accepted before it (most constrained slots first, see
+    SlotGraph.fill_order). Accepted words are written to the crossword and only the
+    rejected slots are requested again, with the accepted letters as constraints.
+    Returns the indices of slots still open afterwards.
+    """
+    graph = crossword.get_slot_graph()
+
+    open_slots = [i for i, word in enumerate(crossword.words) if ' ' in word.word]
+    for round_number in range(max_rounds):
+        if not open_slots:
+            break
+        logger.debug("Requesting words for %d slots, round %d", len(open_slots), round_number + 1)
+        if round_number:
+            metrics.increment("llm.retries")
+
+        constraints = {i: crossword.get_letter_constraints_for_word(crossword.words[i]) for i in open_slots}
+        layout = [
+            {
+                "slot": i,
+                "direction": crossword.words[i].direction,
+                "length": len(crossword.words[i].word),
+                "pattern": constraints[i].to_string(),
+                "crossings": [
+                    {"position": letter_index, "slot": other, "slot_position": other_letter_index}
+                    for letter_index, other, other_letter_index in graph.edges[i]
+                    if other in constraints
+                ],
+            }
+            for i in open_slots
+        ]
+        parsed = _complete(
+            [
+                {"role": "system", "content": PUZZLE_SYSTEM_PROMPT},
+                {"role": "user", "content": PUZZLE_USER_PROMPT.format(
+                    theme=theme, language=language, slots=json.dumps(layout)
+                )},
+            ],
+            PuzzleWords,
+        )
+        answers = {answer.slot: answer for answer in parsed.words}
+
+        used_words = [word.word for word in crossword.words if ' ' not in word.word]
+        accepted: dict[int, SlotWord] = {}
+        # Most constrained slots are accepted first, so a clash drops the easier slot
+        patterns = [crossword.get_letter_constraints_for_word(word).pattern for word in crossword.words]
+        for i in graph.fill_order(patterns, open_slots):
+            answer = answers.get(i)
+            if answer is None:
+                continue
+            try:
+                _validate_word(answer, len(constraints[i].pattern), constraints[i], used_words)
+            except ValueError as e:
+                logger.debug("Rejected slot %d: %s", i, e)
+                continue
+            letters = answer.word.upper()
+            if any(
+                other in accepted and accepted[other].word.upper()[other_letter_index] != letters[letter_index]
+                for letter_index, other, other_letter_index in graph.edges[i]
+            ):
+                logger.debug("Rejected slot %d: '%s' disagrees with a crossing word", i, answer.word)
+                continue
+            accepted[i] = answer
+            used_words.append(letters)
+
+        for i, answer in accepted.items():
+            crossword.update_word(i, answer.word, answer.clue)
+            if word_cache is not None:
+                word_cache.put(theme, language, answer.word, answer.clue)
+        open_slots = [i for i in open_slots if i not in accepted]
+
+    return open_slots
+
+CLUE_SYSTEM_PROMPT = """
+You are a crossword puzzle expert generator.
+You are given a topic and a word that is already placed in a crossword puzzle.
+You will write a clue for that word.
+
+You will return a JSON object with the word and a clue.
+*The clue must be super short
+*The clue should be in the language provided.
+*The clue should fit the theme where possible.
+*The clue must not contain the word itself.
+
+"""
+
+CLUE_USER_PROMPT = """
+Theme: {theme}
+Language: {language}
+Word: {word}
+"""
+
+def generate_clue(theme: str, language: str, word: str) -> Word:
+    """Generate a clue for a word that has already been chosen, e.g. by the local fill engine."""
+    logger.debug("Generating clue for word: %s, theme: %s, language: %s", word, theme, language)
+    parsed = _complete(
+        [
+            {"role": "system", "content": CLUE_SYSTEM_PROMPT},
+            {"role": "user", "content": CLUE_USER_PROMPT.format(theme=theme, language=language, word=word)},
+        ],
+        Word,
+    )
+    return Word(word=word, clue=parsed.clue)
+
 if __name__ == "__main__":
     constraints = LetterConstraint([None, None, "V", None, None])
     print(generate_word("Winter", "Swedish", 5, constraints))
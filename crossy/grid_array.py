@@ -0,0 +1,127 @@
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, Crossword falls back to its Python checks
+    np = None
+
+# Letter codes in the uint8 matrix: 0 is an empty cell, 1 a blank letter
+EMPTY = 0
+BLANK = 1
+
+
+class ArrayGrid:
+    """
+    Array-backed view of a crossword grid for vectorized placement checks.
+
+    Holds a uint8 letter matrix plus across/down coverage masks, all indexed [y, x].
+    legal_starts marks every legal start position of a word in one pass of array
+    operations, using the same rules as Crossword.is_legal_placement. Down words are
+    checked on the transposed arrays. The per-line arrays behind it are shared by all
+    word lengths and cached until the grid changes.
+    """
+
+    def __init__(self, width: int, height: int):
+        if np is None:
+            raise ImportError("ArrayGrid requires numpy")
+        self.width = width
+        self.height = height
+        self.letters = np.zeros((height, width), dtype=np.uint8)
+        self.across = np.zeros((height, width), dtype=bool)
+        self.down = np.zeros((height, width), dtype=bool)
+        self._codes: dict[str, int] = {" ": BLANK, "": BLANK}
+        self._lines_cache: dict = {}
+
+    def _code(self, letter: str) -> int:
+        code = self._codes.get(letter)
+        if code is None:
+            if len(self._codes) >= 255:
+                raise ValueError("ArrayGrid supports at most 254 distinct letters")
+            code = self._codes[letter] = len(self._codes)
+        return code
+
+    def set_letter(self, x: int, y: int, letter: str) -> None:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.letters[y, x] = self._code(letter)
+            self._lines_cache.clear()
+
+    def add_word(self, x: int, y: int, direction: str, letters: str) -> None:
+        """Record a placed word's letters and direction coverage."""
+        across = direction == "across"
+        coverage = self.across if across else self.down
+        for i, letter in enumerate(letters):
+            cell_x, cell_y = (x + i, y) if across else (x, y + i)
+            if 0 <= cell_x < self.width and 0 <= cell_y < self.height:
+                self.letters[cell_y, cell_x] = self._code(letter)
+                coverage[cell_y, cell_x] = True
+        self._lines_cache.clear()
+
+    def _matches(self, codes, letter: str):
+        """Cells where a new letter fits: empty or blank cells, or cells holding the same letter."""
+        code = self._codes.get(letter)
+        # Blanks and letters the grid has never seen only fit on empty or blank cells
+        if code is None or code == BLANK:
+            return codes <= BLANK
+        return (codes <= BLANK) | (codes == code)
+
+    def _lines(self, across: bool, letter: str | None):
+        """
+        Arrays in the word's frame (rows are lines in its direction), shared by every length:
+        letter codes, the run of usable cells starting at each cell, occupancy padded by one
+        cell on each end, and prefix sums of occupancy.
+        """
+        key = (across, letter)
+        if key not in self._lines_cache:
+            codes = self.letters if across else self.letters.T
+            same_direction = self.across if across else self.down.T
+            occupied = codes != EMPTY
+            padded = np.pad(occupied, 1)
+            # New cells need empty neighbours on both sides of the line, shared cells
+            # are only allowed as crossings with perpendicular words
+            sides_free = ~padded[:-2, 1:-1] & ~padded[2:, 1:-1]
+            usable = (~occupied & sides_free) | (occupied & ~same_direction)
+            if letter is not None:
+                usable &= self._matches(codes, letter)
+
+            # Number of consecutive usable cells starting at each cell, counted from the right
+            reversed_usable = usable[:, ::-1]
+            counts = np.cumsum(reversed_usable, axis=1)
+            resets = np.maximum.accumulate(np.where(reversed_usable, 0, counts), axis=1)
+            runs = (counts - resets)[:, ::-1]
+
+            occupied_sums = np.zeros((occupied.shape[0], occupied.shape[1] + 1), dtype=np.int32)
+            np.cumsum(occupied, axis=1, out=occupied_sums[:, 1:])
+            self._lines_cache[key] = (codes, runs, padded[1:-1], occupied_sums)
+        return self._lines_cache[key]
+
+    def legal_starts(self, direction: str, length: int, letters: str | None = None):
+        """
+        Return a bool matrix [y, x] marking the start positions where a word of this
+        length (and these letters, if given) can legally be placed in this direction.
+        """
+        across = direction == "across"
+        starts = np.zeros((self.height, self.width), dtype=bool)
+        columns = self.width if across else self.height
+        if length < 1 or length > columns:
+            return starts
+        if letters is not None and len(letters) != length:
+            raise ValueError(f"Letters '{letters}' do not have length {length}")
+
+        # Words of a single repeated letter, like '-' patterns, fold the letter check into the runs
+        uniform = letters is None or len(set(letters)) == 1
+        codes, runs, bordered, occupied_sums = self._lines(across, letters[0] if letters and uniform else None)
+        count = columns - length + 1
+
+        window_ok = runs[:, :count] >= length
+        if not uniform:
+            for i, letter in enumerate(letters):
+                window_ok &= self._matches(codes, letter)[:, i:count + i]
+
+        # The cells just before and after the word must stay empty
+        window_ok &= ~bordered[:, :count] & ~bordered[:, length + 1:]
+
+        # The word has to cross something, unless the grid is still empty
+        if occupied_sums[:, -1].any():
+            window_ok &= occupied_sums[:, length:] > occupied_sums[:, :count]
+
+        frame = starts if across else starts.T
+        frame[:, :count] = window_ok
+        return starts
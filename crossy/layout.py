@@ -0,0 +1,143 @@
+import logging
+import multiprocessing
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from . import metrics
+from .fill import fill_crossword
+from .lexicon import Lexicon, load_lexicon
+from .model import Crossword, Word, generate_word_pattern
+
+logger = logging.getLogger(__name__)
+
+# Worker processes of the shared layout pool, by default one per core
+LAYOUT_PROCESSES = int(os.environ.get("CROSSY_LAYOUT_PROCESSES", "0")) or os.cpu_count() or 1
+
+# Worker processes shared by all layout requests, started on first use
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Return the shared worker pool, creating it with LAYOUT_PROCESSES workers on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawned rather than forked: forking a threaded server process can copy locks
+            # held by other threads into the child and deadlock it
+            _pool = ProcessPoolExecutor(
+                max_workers=LAYOUT_PROCESSES, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def score_layout(
+    words: list[Word],
+    width: int,
+    height: int,
+    num_words: int,
+    lexicon: Lexicon | None = None,
+    max_backtracks: int = 200,
+) -> dict:
+    """
+    Score a word pattern; higher is better.
+
+    Combines the share of requested words that were placed, crossings per word, the
+    share of grid cells in use and, when a lexicon is given, whether a quick fill with
+    a small backtrack budget succeeds.
+    """
+    crossword = Crossword(width, height)
+    for word in words:
+        crossword.add_word(Word(" " * len(word.word), word.pos_x, word.pos_y, word.direction))
+
+    crossings = len(crossword.get_crossings()) // 2
+    scores = {
+        "words": len(words) / num_words,
+        "crossings": crossings / len(words) if words else 0.0,
+        "fill_ratio": len(crossword.cells()) / (width * height),
+        "fillable": None,
+    }
+    scores["score"] = scores["words"] + 0.5 * scores["crossings"] + scores["fill_ratio"]
+    if lexicon is not None:
+        try:
+            fill_crossword(crossword, lexicon, max_backtracks=max_backtracks)
+            scores["fillable"] = True
+            scores["score"] += 1.0
+        except ValueError:
+            scores["fillable"] = False
+    return scores
+
+
+def _generate_candidate(
+    width: int, height: int, num_words: int, seed: int, lexicon_path: str
+) -> tuple[dict, list[Word]]:
+    """Worker: generate and score one layout for a seed."""
+    random.seed(seed)
+    words = generate_word_pattern(width, height, num_words)
+    lexicon = load_lexicon(lexicon_path) if lexicon_path else None
+    return score_layout(words, width, height, num_words, lexicon), words
+
+
+def generate_best_word_pattern(
+    width: int,
+    height: int,
+    num_words: int,
+    time_budget: float = 1.0,
+    max_candidates: int = 256,
+    lexicon_path: str = "",
+    seed: int | None = None,
+) -> list[Word]:
+    """
+    Generate many candidate word patterns across a process pool and return the best one.
+
+    Candidates use consecutive seeds and are scored with score_layout, using the
+    lexicon at lexicon_path for the fillability check when given. New candidates are
+    submitted while the time budget lasts, up to max_candidates; at least one
+    candidate is always waited for.
+
+    The pool of LAYOUT_PROCESSES workers is shared by all calls and started by the
+    first one, which also waits for the workers to start. Candidates still queued at
+    the deadline are cancelled and results of ones already running are ignored, so at
+    most one candidate per worker outlives the call.
+    """
+    seed = random.randrange(2 ** 32) if seed is None else seed
+    deadline = time.monotonic() + time_budget
+
+    best_score, best_words = None, []
+    pool = _get_pool()
+    submitted = 0
+    evaluated = 0
+    pending = set()
+    try:
+        # Enough to keep every worker busy while results come back
+        while submitted < min(2 * LAYOUT_PROCESSES, max_candidates):
+            pending.add(pool.submit(
+                _generate_candidate, width, height, num_words, seed + submitted, lexicon_path
+            ))
+            submitted += 1
+
+        while pending:
+            timeout = None if best_score is None else max(0.0, deadline - time.monotonic())
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                scores, words = future.result()
+                evaluated += 1
+                if best_score is None or scores["score"] > best_score["score"]:
+                    best_score, best_words = scores, words
+                if time.monotonic() < deadline and submitted < max_candidates:
+                    pending.add(pool.submit(
+                        _generate_candidate, width, height, num_words, seed + submitted, lexicon_path
+                    ))
+                    submitted += 1
+            if time.monotonic() >= deadline:
+                break
+    finally:
+        for future in pending:
+            future.cancel()
+
+    metrics.increment("layout.candidates", evaluated)
+    logger.info("Best of %d layouts: %s", evaluated, best_score)
+    return best_words
@@ -0,0 +1,292 @@
+import mmap
+import struct
+import sys
+from functools import lru_cache
+from typing import Iterable, Iterator
+
+from .generate import LetterConstraint
+
+# Compiled lexicon file layout (little-endian):
+#   header   MAGIC, word count, length count, bitset count, then section offsets
+#   lengths  (length, first word id, word count) per word length
+#   bitsets  (length, position, letter code point, offset) per index entry
+#   words    word id -> byte offset table followed by the UTF-8 string table
+#   clues    word id -> byte offset table followed by the UTF-8 clue table
+#   data     the bitsets themselves, 8-byte aligned
+MAGIC = b"CRSYLEX1"
+_HEADER = struct.Struct("<8sIII6Q")
+_LENGTH = struct.Struct("<III")
+_BITSET = struct.Struct("<IIIQ")
+_OFFSET = struct.Struct("<I")
+
+
+def _read_entries(path: str) -> Iterator[tuple[str, str, float]]:
+    """
+    Yield (word, clue, frequency) from a word list with one entry per line.
+
+    Lines are 'WORD', 'WORD<TAB>CLUE' or 'WORD<TAB>CLUE<TAB>FREQUENCY'.
+    Blank lines and '#' comments are skipped.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            columns = line.rstrip("\n").split("\t")
+            clue = columns[1].strip() if len(columns) > 1 else ""
+            frequency = float(columns[2]) if len(columns) > 2 and columns[2].strip() else 0.0
+            yield columns[0].strip(), clue, frequency
+
+
+def _ranked_entries(path: str) -> list[tuple[str, str, float]]:
+    """Read a word list, most frequent words first (file order among equals)."""
+    return sorted(_read_entries(path), key=lambda entry: -entry[2])
+
+
+def _first_clues(entries: Iterable[tuple[str, str, float]]) -> dict[str, str]:
+    """Map each word to the clue of its first entry, matching the entry Lexicon keeps."""
+    clues: dict[str, str] = {}
+    for word, clue, _ in entries:
+        clues.setdefault(word.strip().upper(), clue)
+    return {word: clue for word, clue in clues.items() if clue}
+
+
+@lru_cache(maxsize=None)
+def load_word_list(path: str) -> tuple[str, ...]:
+    """Load a word list once per process."""
+    return tuple(word for word, _, _ in _read_entries(path))
+
+
+@lru_cache(maxsize=None)
+def load_lexicon(path: str) -> "Lexicon":
+    """Open a compiled lexicon, or load and index a plain word list, once per process."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) == MAGIC:
+            return MappedLexicon(path)
+    entries = _ranked_entries(path)
+    return Lexicon(
+        (word for word, _, _ in entries),
+        clues=_first_clues(entries),
+    )
+
+
+def _bits_from_ids(ids: list[int], size: int) -> int:
+    """Build an integer bitset with the given bit positions set."""
+    buffer = bytearray((size + 7) // 8)
+    for i in ids:
+        buffer[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buffer, "little")
+
+
+class Lexicon:
+    """
+    Word list indexed by length and by (position, letter).
+
+    Words of each length get consecutive ids, and every (length, position, letter)
+    maps to an integer bitset of the ids with that letter at that position. A pattern
+    like '_A_T_' is answered by AND-ing the bitsets of its fixed letters, so matching
+    and counting run over machine words instead of Python loops over the word list.
+    """
+
+    def __init__(self, words: Iterable[str], clues: dict[str, str] | None = None):
+        self._words: dict[int, list[str]] = {}
+        seen = set()
+        for word in words:
+            word = word.strip().upper()
+            if word.isalpha() and word not in seen:
+                seen.add(word)
+                self._words.setdefault(len(word), []).append(word)
+        self._clues = clues or {}
+
+        self._index: dict[tuple[int, int, str], int] = {}
+        for length, bucket in self._words.items():
+            postings: dict[tuple[int, str], list[int]] = {}
+            for word_id, word in enumerate(bucket):
+                for position, letter in enumerate(word):
+                    postings.setdefault((position, letter), []).append(word_id)
+            for (position, letter), ids in postings.items():
+                self._index[(length, position, letter)] = _bits_from_ids(ids, len(bucket))
+
+    def size(self, length: int) -> int:
+        """Return the number of words of this length."""
+        return len(self._words.get(length, ()))
+
+    def lengths(self) -> list[int]:
+        """Return the word lengths present in the lexicon."""
+        return sorted(self._words)
+
+    def __len__(self) -> int:
+        return sum(self.size(length) for length in self.lengths())
+
+    def __contains__(self, word: str) -> bool:
+        return self.count(LetterConstraint(list(word.upper()))) > 0
+
+    def word(self, length: int, word_id: int) -> str:
+        """Return the word with the given id among words of this length."""
+        return self._words[length][word_id]
+
+    def clue(self, word: str) -> str:
+        """Return the clue stored with a word, or an empty string."""
+        return self._clues.get(word.upper(), "")
+
+    def position_bits(self, length: int, position: int, letter: str) -> int:
+        """Bitset of the words of this length that have the letter at the position."""
+        return self._index.get((length, position, letter.upper()), 0)
+
+    def match_bits(self, pattern: LetterConstraint | str) -> int:
+        """Bitset of the words matching a pattern such as '_A_T_'."""
+        if isinstance(pattern, str):
+            pattern = LetterConstraint.from_string(pattern)
+        length = len(pattern.pattern)
+        bits = (1 << self.size(length)) - 1
+        for position, letter in enumerate(pattern.pattern):
+            if letter is not None and bits:
+                bits &= self.position_bits(length, position, letter)
+        return bits
+
+    def words_from_bits(self, length: int, bits: int) -> list[str]:
+        """Return the words of this length whose ids are set in the bitset, in list order."""
+        # Reversed binary string has bit i at index i; str.find skips the zero runs in C
+        binary = bin(bits)[:1:-1]
+        words = []
+        i = binary.find("1")
+        while i != -1:
+            words.append(self.word(length, i))
+            i = binary.find("1", i + 1)
+        return words
+
+    def match(self, pattern: LetterConstraint | str) -> list[str]:
+        """Return all words matching a pattern such as '_A_T_'."""
+        if isinstance(pattern, str):
+            pattern = LetterConstraint.from_string(pattern)
+        return self.words_from_bits(len(pattern.pattern), self.match_bits(pattern))
+
+    def count(self, pattern: LetterConstraint | str) -> int:
+        """Return the number of words matching a pattern, without materializing them."""
+        return self.match_bits(pattern).bit_count()
+
+
+def compile_lexicon(source_path: str, target_path: str) -> None:
+    """
+    Compile a plain word list into the binary lexicon format read by MappedLexicon.
+
+    Words are ordered by descending frequency within each length, so candidate lists
+    come out best-first. Clues are stored alongside the words; frequencies only
+    determine the order.
+    """
+    entries = _ranked_entries(source_path)
+    lexicon = Lexicon(word for word, _, _ in entries)
+    clues = _first_clues(entries)
+
+    lengths = lexicon.lengths()
+    words = [word for length in lengths for word in lexicon._words[length]]
+    index = sorted(lexicon._index.items())
+
+    def string_table(strings: list[str]) -> bytes:
+        offsets = [0]
+        blob = bytearray()
+        for string in strings:
+            blob += string.encode("utf-8")
+            offsets.append(len(blob))
+        if len(blob) > 0xFFFFFFFF:
+            raise ValueError("String table exceeds 4 GiB")
+        return b"".join(_OFFSET.pack(offset) for offset in offsets) + blob
+
+    def align(offset: int) -> int:
+        return (offset + 7) & ~7
+
+    lengths_offset = _HEADER.size
+    bitsets_offset = lengths_offset + _LENGTH.size * len(lengths)
+    words_section = string_table(words)
+    clues_section = string_table([clues.get(word, "") for word in words])
+    words_offset = bitsets_offset + _BITSET.size * len(index)
+    clues_offset = words_offset + len(words_section)
+    data_offset = align(clues_offset + len(clues_section))
+
+    length_table = bytearray()
+    first_id = 0
+    for length in lengths:
+        length_table += _LENGTH.pack(length, first_id, lexicon.size(length))
+        first_id += lexicon.size(length)
+
+    bitset_table = bytearray()
+    data = bytearray()
+    for (length, position, letter), bits in index:
+        bitset_table += _BITSET.pack(length, position, ord(letter), data_offset + len(data))
+        data += bits.to_bytes((lexicon.size(length) + 7) // 8, "little")
+        data += bytes(align(len(data)) - len(data))
+
+    with open(target_path, "wb") as f:
+        f.write(_HEADER.pack(
+            MAGIC, len(words), len(lengths), len(index),
+            lengths_offset, bitsets_offset, words_offset, clues_offset, data_offset, 0,
+        ))
+        f.write(length_table)
+        f.write(bitset_table)
+        f.write(words_section)
+        f.write(clues_section)
+        f.write(bytes(data_offset - clues_offset - len(clues_section)))
+        f.write(data)
+
+
+class MappedLexicon(Lexicon):
+    """
+    Lexicon backed by a memory-mapped file written by compile_lexicon.
+
+    Opening only reads the small length and bitset directories; words, clues and
+    bitsets are read from the mapping on demand, so worker processes share the
+    pages through the OS page cache instead of each parsing its own copy.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, self._count, length_count, bitset_count,
+         lengths_offset, bitsets_offset, self._words_offset, self._clues_offset, _, _) = _HEADER.unpack_from(self._mm)
+        if magic != MAGIC:
+            raise ValueError(f"'{path}' is not a compiled lexicon")
+
+        self._lengths: dict[int, tuple[int, int]] = {}
+        for length, first_id, count in _LENGTH.iter_unpack(
+            self._mm[lengths_offset:lengths_offset + _LENGTH.size * length_count]
+        ):
+            self._lengths[length] = (first_id, count)
+
+        self._bitset_offsets: dict[tuple[int, int, str], int] = {}
+        for length, position, code_point, offset in _BITSET.iter_unpack(
+            self._mm[bitsets_offset:bitsets_offset + _BITSET.size * bitset_count]
+        ):
+            self._bitset_offsets[(length, position, chr(code_point))] = offset
+
+    def _string(self, table_offset: int, global_id: int) -> str:
+        start, end = struct.unpack_from("<II", self._mm, table_offset + _OFFSET.size * global_id)
+        blob_offset = table_offset + _OFFSET.size * (self._count + 1)
+        return self._mm[blob_offset + start:blob_offset + end].decode("utf-8")
+
+    def size(self, length: int) -> int:
+        return self._lengths.get(length, (0, 0))[1]
+
+    def lengths(self) -> list[int]:
+        return sorted(self._lengths)
+
+    def word(self, length: int, word_id: int) -> str:
+        return self._string(self._words_offset, self._lengths[length][0] + word_id)
+
+    def clue(self, word: str) -> str:
+        word = word.upper()
+        bits = self.match_bits(LetterConstraint(list(word)))
+        if not bits:
+            return ""
+        return self._string(self._clues_offset, self._lengths[len(word)][0] + bits.bit_length() - 1)
+
+    def position_bits(self, length: int, position: int, letter: str) -> int:
+        # Converted from the mapping on every call rather than kept, so the only copy
+        # that outlives a query is the page cache shared by all processes
+        offset = self._bitset_offsets.get((length, position, letter.upper()))
+        if offset is None:
+            return 0
+        return int.from_bytes(self._mm[offset:offset + (self.size(length) + 7) // 8], "little")
+
+
+if __name__ == "__main__":
+    # python -m crossy.lexicon words.txt words.lex
+    compile_lexicon(sys.argv[1], sys.argv[2])
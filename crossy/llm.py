@@ -0,0 +1,112 @@
+import json
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Iterable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .lexicon import Lexicon
+
+_client = None
+
+
+def get_client() -> Any:
+    """Return the chat client used for generation, creating an OpenAI client on first use."""
+    global _client
+    if _client is None:
+        from openai import OpenAI
+        _client = OpenAI()
+    return _client
+
+
+def set_client(client: Any) -> None:
+    """Replace the chat client, e.g. with a FakeClient for offline runs."""
+    global _client
+    _client = client
+
+
+class FakeClient:
+    """
+    Deterministic stand-in for the OpenAI client that answers from a word list.
+
+    Implements the `beta.chat.completions.parse` call used by crossy.generate and
+    understands its prompts: single words, ranked candidates, whole-puzzle layouts
+    and clues. Answers depend only on the seed and the messages, so runs are
+    repeatable even when slots are generated concurrently. Every call sleeps for
+    `latency` seconds, and with probability `failure_rate` returns a word that
+    breaks the requested pattern so the retry paths are exercised. Words the prompt
+    excludes are avoided, but crossings in puzzle layouts are ignored, like a
+    careless model would. Call and retry counts are kept for benchmarks, and
+    responses carry rough token usage like the real client's.
+    """
+
+    def __init__(
+        self,
+        words: "Lexicon | Iterable[str]",
+        latency: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        # Imported here because crossy.lexicon depends on crossy.generate, which uses this module
+        from .lexicon import Lexicon
+        self.lexicon = words if isinstance(words, Lexicon) else Lexicon(words)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self.retries = 0
+        self.seed = seed
+        self._lock = threading.Lock()
+        self.beta = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(parse=self.parse)))
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.calls = 0
+            self.retries = 0
+
+    def _pick(self, rng: random.Random, pattern: str, count: int = 1, exclude: Iterable[str] = ()) -> list[str]:
+        """Pick words matching a pattern, or a wrong word at the configured failure rate."""
+        exclude = set(exclude)
+        matches = [word for word in self.lexicon.match(pattern) if word not in exclude]
+        if not matches or rng.random() < self.failure_rate:
+            return ["X" * (len(pattern) + 1)]
+        return rng.sample(matches, min(count, len(matches)))
+
+    def parse(self, model: str, messages: list[dict], response_format: type) -> Any:
+        with self._lock:
+            self.calls += 1
+            if any(message["content"].startswith("Previous attempt failed") for message in messages):
+                self.retries += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        rng = random.Random(f"{self.seed}\n{json.dumps(messages)}")
+        prompt = messages[1]["content"]
+        excluded = re.search(r"Do not use any of these words: (.*)", prompt)
+        exclude = excluded.group(1).split(", ") if excluded else []
+        if "Slots:" in prompt:
+            slots = json.loads(prompt.split("Slots:", 1)[1])
+            words = []
+            for slot in slots:
+                word = self._pick(rng, slot["pattern"])[0]
+                words.append({"slot": slot["slot"], "word": word, "clue": f"Clue for {word}"})
+            parsed = response_format(words=words)
+        elif re.search(r"Return \d+ different", prompt):
+            pattern = re.search(r"Letter pattern: (\S+)", prompt).group(1)
+            count = int(re.search(r"Return (\d+) different", prompt).group(1))
+            words = self._pick(rng, pattern, count, exclude)
+            parsed = response_format(words=[{"word": word, "clue": f"Clue for {word}"} for word in words])
+        elif "Letter pattern:" in prompt:
+            word = self._pick(rng, re.search(r"Letter pattern: (\S+)", prompt).group(1), exclude=exclude)[0]
+            parsed = response_format(word=word, clue=f"Clue for {word}")
+        else:
+            word = re.search(r"Word: (\S+)", prompt).group(1)
+            parsed = response_format(word=word, clue=f"Clue for {word}")
+
+        # Rough token counts, about four characters per token
+        usage = SimpleNamespace(
+            prompt_tokens=sum(len(message["content"]) for message in messages) // 4,
+            completion_tokens=len(str(parsed)) // 4,
+        )
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(parsed=parsed))], usage=usage)
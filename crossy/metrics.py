@@ -0,0 +1,149 @@
+"""
+In-process metrics: counters, histograms and timers.
+
+    from crossy import metrics
+
+    metrics.enable()
+    metrics.increment("llm.calls")
+    with metrics.timer("fill.duration"):
+        ...
+    print(metrics.snapshot())
+
+Recording is off unless CROSSY_METRICS is set, enable() is called or a sink is
+set, so instrumented code only pays for a flag check when nothing reads the
+values. Once on, it is thread safe and only updates a few numbers. Every recorded
+value is also passed to the sink set with set_sink, e.g. to forward it to StatsD
+or a log.
+"""
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable
+
+# Called as sink(kind, name, value) with kind "counter" or "histogram"
+Sink = Callable[[str, str, float], None]
+
+# Upper bounds of the histogram buckets, in seconds for durations
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0)
+
+
+class Histogram:
+    """Count, sum, min, max and bucket counts of observed values."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def to_dict(self) -> dict:
+        bounds = [str(bound) for bound in self.buckets] + ["+inf"]
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.total / self.count if self.count else 0.0,
+            "buckets": dict(zip(bounds, self.bucket_counts)),
+        }
+
+
+_lock = threading.Lock()
+_counters: dict[str, float] = {}
+_histograms: dict[str, Histogram] = {}
+_sink: Sink | None = None
+_enabled = bool(os.environ.get("CROSSY_METRICS"))
+
+
+def enable(enabled: bool = True) -> None:
+    """Turn recording into counters and histograms on or off."""
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    """Whether recorded values are kept or forwarded anywhere."""
+    return _enabled or _sink is not None
+
+
+def set_sink(sink: Sink | None) -> None:
+    """Forward every recorded value to sink, or stop forwarding with None."""
+    global _sink
+    _sink = sink
+
+
+def increment(name: str, value: float = 1) -> None:
+    """Add value to a counter."""
+    if not _enabled and _sink is None:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+    if _sink is not None:
+        _sink("counter", name, value)
+
+
+def observe(name: str, value: float, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+    """Record a value in a histogram; buckets only apply when the histogram is created."""
+    if not _enabled and _sink is None:
+        return
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram(buckets)
+        histogram.observe(value)
+    if _sink is not None:
+        _sink("histogram", name, value)
+
+
+@contextmanager
+def timer(name: str):
+    """Record the duration of the block in seconds in a histogram, also when it raises."""
+    if not _enabled and _sink is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start)
+
+
+def timed(name: str):
+    """Decorator version of timer."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled and _sink is None:
+                return func(*args, **kwargs)
+            with timer(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def snapshot() -> dict:
+    """Return the current counters and histogram summaries."""
+    with _lock:
+        return {
+            "counters": dict(_counters),
+            "histograms": {name: histogram.to_dict() for name, histogram in _histograms.items()},
+        }
+
+
+def reset() -> None:
+    """Clear all counters and histograms, e.g. between benchmark runs."""
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
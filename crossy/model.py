@@ -1,7 +1,41 @@
+import logging
 import random
+import struct
+import zlib
 import reflex as rx
 from enum import Enum
+from . import metrics
 from .generate import LetterConstraint
+from .grid_array import ArrayGrid, np
+from .render import render
+from .slots import SlotGraph
+
+try:
+    from pydantic.v1 import PrivateAttr
+except ModuleNotFoundError:
+    from pydantic import PrivateAttr
+
+logger = logging.getLogger(__name__)
+
+# Serialized crossword layout (little-endian), zlib-compressed as a whole:
+#   width, height, word count, then the topic
+#   per word: pos_x, pos_y, 1 if down, then its letters and clue
+# Strings are a byte length followed by UTF-8, so each is at most 65535 bytes
+_CROSSWORD = struct.Struct("<HHH")
+_WORD = struct.Struct("<HHB")
+_STRING_LENGTH = struct.Struct("<H")
+
+
+def _pack_string(value: str) -> bytes:
+    encoded = value.encode("utf-8")
+    return _STRING_LENGTH.pack(len(encoded)) + encoded
+
+
+def _unpack_string(data: bytes, offset: int) -> tuple[str, int]:
+    (length,) = _STRING_LENGTH.unpack_from(data, offset)
+    start = offset + _STRING_LENGTH.size
+    return data[start:start + length].decode("utf-8"), start + length
+
 class Direction(str, Enum):
     ACROSS = "across"
     DOWN = "down"
@@ -37,12 +71,42 @@ class Cell(rx.Base):
             number=number,
             is_black=is_black
         )
+
+class Clue(rx.Base):
+    number: int
+    direction: Direction
+    clue: str
+    length: int
+    word_index: int
+
+class GridLayout(rx.Base):
+    """Black/white mask, clue numbers per cell (0 for none) and clue lists sorted by number."""
+    is_black: list[list[bool]]
+    numbers: list[list[int]]
+    across: list[Clue]
+    down: list[Clue]
     
 class Crossword(rx.Base):
     width: int
     height: int
     words: list[Word]
     topic: str
+    # Occupancy index: (x, y) -> letter of every filled cell, kept in sync by add_word
+    _cells: dict[tuple[int, int], str] = PrivateAttr(default_factory=dict)
+    # (x, y) -> [(word index, letter index)] for every word covering the cell
+    _cell_words: dict[tuple[int, int], list[tuple[int, int]]] = PrivateAttr(default_factory=dict)
+    # Cached solution grid, updated in place by add_word and update_word
+    _grid: list[list[str]] | None = PrivateAttr(default=None)
+    # Cached mask, numbering and clue lists, rebuilt after add_word and update_word
+    _layout: GridLayout | None = PrivateAttr(default=None)
+    # NumPy view of the grid for vectorized placement queries, built on first use when numpy is installed
+    _array: ArrayGrid | None = PrivateAttr(default=None)
+    # Crossings of every word, built on first use and rebuilt after add_word
+    _slot_graph: SlotGraph | None = PrivateAttr(default=None)
+    # Bumped by every add_word and update_word; rendered output is cached per version
+    _version: int = PrivateAttr(default=0)
+    # Format -> ((version, topic), output) of the last render in that format, see crossy.render
+    _renders: dict[str, tuple[tuple[int, str], str]] = PrivateAttr(default_factory=dict)
     
     def __init__(self, width: int, height: int):
         super().__init__(
@@ -52,6 +116,31 @@ class Crossword(rx.Base):
             topic=""
         )
         
+    def to_bytes(self) -> bytes:
+        """Serialize the grid size, topic, words and clues into a compact record; see from_bytes."""
+        parts = [_CROSSWORD.pack(self.width, self.height, len(self.words)), _pack_string(self.topic)]
+        for word in self.words:
+            parts.append(_WORD.pack(word.pos_x, word.pos_y, word.direction == Direction.DOWN))
+            parts.append(_pack_string(word.word))
+            parts.append(_pack_string(word.clue))
+        return zlib.compress(b"".join(parts), 9)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Crossword":
+        """Load a crossword written by to_bytes."""
+        data = zlib.decompress(data)
+        width, height, word_count = _CROSSWORD.unpack_from(data)
+        topic, offset = _unpack_string(data, _CROSSWORD.size)
+        crossword = cls(width, height)
+        crossword.topic = topic
+        for _ in range(word_count):
+            pos_x, pos_y, down = _WORD.unpack_from(data, offset)
+            letters, offset = _unpack_string(data, offset + _WORD.size)
+            clue, offset = _unpack_string(data, offset)
+            # The crossword was valid when it was saved, so the placement checks are skipped
+            crossword.add_slot(Word(letters, pos_x, pos_y, Direction.DOWN if down else Direction.ACROSS, clue))
+        return crossword
+
     def _check_boundaries(self, word: Word) -> None:
         """Verify if the word fits within the grid boundaries."""
         #print("Checking boundaries for word: ", word.word)
@@ -65,19 +154,15 @@ class Crossword(rx.Base):
         #print("Checking letter conflicts for word: ", word.word)
         for i, letter in enumerate(word.word):
             curr_x, curr_y = self._get_coordinate_at_index(word, i)
+            existing_letter = self._cells.get((curr_x, curr_y))
             
-            for existing_word in self.words:
-                for j, existing_letter in enumerate(existing_word.word):
-                    check_x, check_y = self._get_coordinate_at_index(existing_word, j)
-                    
-                    if curr_x == check_x and curr_y == check_y:
-                        if existing_letter == ' ' or existing_letter == "":
-                            continue
-                        if letter != existing_letter:
-                            raise ValueError(
-                                f"Letter conflict at position ({curr_x}, {curr_y}): "
-                                f"'{letter}' vs '{existing_letter}'"
-                            )
+            if existing_letter is None or existing_letter == ' ' or existing_letter == "":
+                continue
+            if letter != existing_letter:
+                raise ValueError(
+                    f"Letter conflict at position ({curr_x}, {curr_y}): "
+                    f"'{letter}' vs '{existing_letter}'"
+                )
                             
 
     def _get_coordinate_at_index(self, word: Word, index: int) -> tuple[int, int]:
@@ -96,12 +181,40 @@ class Crossword(rx.Base):
         if not self.words:  # First word doesn't need intersection
             return True
             
-        word_coords = set(self._get_word_coordinates(word))
-        existing_coords = set()
-        for existing_word in self.words:
-            existing_coords.update(self._get_word_coordinates(existing_word))
-            
-        return bool(word_coords & existing_coords)  # Return True if there's any intersection
+        return any(coord in self._cells for coord in self._get_word_coordinates(word))
+
+    def _index_word(self, word: Word) -> None:
+        """Record the cells of a word in the occupancy index and the cached grid."""
+        word_index = len(self.words) - 1
+        for i, letter in enumerate(word.word):
+            coord = self._get_coordinate_at_index(word, i)
+            self._cell_words.setdefault(coord, []).append((word_index, i))
+            self._set_cell(coord, letter)
+        self._layout = None
+        self._slot_graph = None
+        self._version += 1
+        if self._array is not None:
+            self._array.add_word(word.pos_x, word.pos_y, word.direction, word.word)
+
+    def _set_cell(self, coord: tuple[int, int], letter: str) -> None:
+        """Write a letter to the occupancy index and, if it is built, the cached grid."""
+        self._cells[coord] = letter
+        x, y = coord
+        if self._grid is not None and 0 <= x < self.width and 0 <= y < self.height:
+            self._grid[y][x] = letter
+        if self._array is not None:
+            self._array.set_letter(x, y, letter)
+
+    def _get_array(self) -> ArrayGrid:
+        """Return the NumPy view of the grid, building it from the placed words on first use."""
+        if self._array is None:
+            self._array = ArrayGrid(self.width, self.height)
+            for word in self.words:
+                self._array.add_word(word.pos_x, word.pos_y, word.direction, word.word)
+            # Later words may have overwritten letters, the occupancy index has the final ones
+            for (x, y), letter in self._cells.items():
+                self._array.set_letter(x, y, letter)
+        return self._array
 
     def add_word(self, word: Word):
         """Add a word to the crossword after validating position and conflicts."""
@@ -113,136 +226,268 @@ class Crossword(rx.Base):
             raise ValueError(f"Word '{word.word}' must intersect with existing words")
             
         #print("Word added to crossword")
-        self.words.append(word)
+        self.add_slot(word)
+
+    def _check_placement(self, x: int, y: int, direction: Direction, letters: str) -> bool:
+        """Check a placement given by its start, direction and letters; see is_legal_placement."""
+        dx, dy = (1, 0) if direction == Direction.ACROSS else (0, 1)
+        end_x, end_y = x + dx * (len(letters) - 1), y + dy * (len(letters) - 1)
+        if not letters or x < 0 or y < 0 or end_x >= self.width or end_y >= self.height:
+            return False
+
+        # The cells just before and after the word must stay empty
+        if (x - dx, y - dy) in self._cells or (end_x + dx, end_y + dy) in self._cells:
+            return False
+
+        crosses = not self.words
+        for i, letter in enumerate(letters):
+            coord = (x + dx * i, y + dy * i)
+            existing_letter = self._cells.get(coord)
+            if existing_letter is None:
+                # A new cell must not sit alongside another word
+                if (coord[0] + dy, coord[1] + dx) in self._cells or (coord[0] - dy, coord[1] - dx) in self._cells:
+                    return False
+                continue
+            # Shared cells are only allowed as crossings with perpendicular words
+            if any(self.words[w].direction == direction for w, _ in self._cell_words[coord]):
+                return False
+            if existing_letter not in (' ', '') and letter != existing_letter:
+                return False
+            crosses = True
+        return crosses
+
+    def is_legal_placement(self, word: Word) -> bool:
+        """
+        Check if a word can be added as a proper crossword entry: inside the grid, without
+        letter conflicts, crossing an existing word, sharing cells only with perpendicular
+        words, and neither touching another word end to end nor running alongside one.
+        """
+        return self._check_placement(word.pos_x, word.pos_y, word.direction, word.word)
+
+    def get_legal_placements(self, direction: Direction, length: int) -> list[Word]:
+        """Return every legal '-' pattern word of this direction and length, ordered by row then column."""
+        if np is not None:
+            ys, xs = np.nonzero(self._get_array().legal_starts(direction, length, "-" * length))
+            return [Word("-" * length, int(x), int(y), direction) for y, x in zip(ys, xs)]
+        return [
+            Word("-" * length, x, y, direction)
+            for y in range(self.height)
+            for x in range(self.width)
+            if self._check_placement(x, y, direction, "-" * length)
+        ]
+
+    def get_open_placements(self, direction: Direction, length: int) -> list[Word]:
+        """
+        Return a blank word at every position where some word of this direction and length
+        could legally be placed, whatever its letters, ordered by row then column. Letters
+        it would have to share are not included; see get_letter_constraints_for_word.
+        """
+        if np is not None:
+            ys, xs = np.nonzero(self._get_array().legal_starts(direction, length))
+            return [Word(" " * length, int(x), int(y), direction) for y, x in zip(ys, xs)]
+        dx, dy = (1, 0) if direction == Direction.ACROSS else (0, 1)
+        placements = []
+        for y in range(self.height):
+            for x in range(self.width):
+                # Reusing the letters already in the grid leaves only the structural checks
+                letters = "".join(self._cells.get((x + dx * i, y + dy * i), " ") for i in range(length))
+                if self._check_placement(x, y, direction, letters):
+                    placements.append(Word(" " * length, x, y, direction))
+        return placements
+
+    def get_crossing_placements(self, parent: Word, min_length: int, max_length: int) -> list[Word]:
+        """
+        Return every legal '-' pattern word that crosses the parent word, as in generate_word_pattern,
+        ordered by length, row and column. Uses the vectorized ArrayGrid checks when numpy is installed.
+        """
+        direction = Direction.DOWN if parent.direction == Direction.ACROSS else Direction.ACROSS
+        if np is None:
+            placements = []
+            for x, y in self._get_word_coordinates(parent):
+                for length in range(min_length, max_length + 1):
+                    for offset in range(length):
+                        start_x, start_y = (x - offset, y) if direction == Direction.ACROSS else (x, y - offset)
+                        if self._check_placement(start_x, start_y, direction, "-" * length):
+                            placements.append(Word("-" * length, start_x, start_y, direction))
+            placements.sort(key=lambda word: (len(word.word), word.pos_y, word.pos_x))
+            return placements
+
+        placements = []
+        for length in range(min_length, max_length + 1):
+            starts = self._get_array().legal_starts(direction, length, "-" * length)
+            # Starts of crossing words lie within length - 1 cells before the parent's line
+            if direction == Direction.ACROSS:
+                top, left = parent.pos_y, max(0, parent.pos_x - length + 1)
+                window = starts[top:parent.pos_y + len(parent.word), left:parent.pos_x + 1]
+            else:
+                top, left = max(0, parent.pos_y - length + 1), parent.pos_x
+                window = starts[top:parent.pos_y + 1, left:parent.pos_x + len(parent.word)]
+            ys, xs = np.nonzero(window)
+            placements.extend(
+                Word("-" * length, left + int(x), top + int(y), direction) for y, x in zip(ys, xs)
+            )
+        return placements
+
+    def get_slot_graph(self) -> SlotGraph:
+        """Return the cached crossing graph of the words, built on first use. Do not mutate it."""
+        if self._slot_graph is None:
+            self._slot_graph = SlotGraph([len(word.word) for word in self.words], self._cell_words)
+        return self._slot_graph
+
+    def get_crossings(self) -> list[tuple[int, int, int, int]]:
+        """Return (word index, letter index, other word index, other letter index) for every shared cell."""
+        return list(self.get_slot_graph().crossings())
+
+    def get_fill_waves(self) -> list[list[int]]:
+        """
+        Group word indices into waves in which no two words cross each other.
+
+        Words within a wave can be generated concurrently; each wave only depends on
+        letters from earlier waves. Words are assigned most constrained first (see
+        SlotGraph.fill_order), so the number of waves follows the depth of the crossing
+        graph rather than the word count and constrained words land in early waves.
+        """
+        graph = self.get_slot_graph()
+        patterns = [self.get_letter_constraints_for_word(word).pattern for word in self.words]
+        wave_of: dict[int, int] = {}
+        for i in graph.fill_order(patterns, range(len(self.words))):
+            taken = {wave_of[j] for _, j, _ in graph.edges[i] if j in wave_of}
+            wave_of[i] = next(wave for wave in range(len(self.words)) if wave not in taken)
+
+        waves: list[list[int]] = [[] for _ in range(max(wave_of.values(), default=-1) + 1)]
+        for i in range(len(self.words)):
+            waves[wave_of[i]].append(i)
+        return waves
+
+    def update_word(self, index: int, letters: str, clue: str = "") -> None:
+        """Replace the letters (and clue) of an already placed word, keeping the grid in sync."""
+        word = self.words[index]
+        letters = letters.upper()
+        if len(letters) != len(word.word):
+            raise ValueError(
+                f"Word '{letters}' length ({len(letters)}) does not match slot length ({len(word.word)})"
+            )
+
+        coords = self._get_word_coordinates(word)
+        for coord, letter in zip(coords, letters):
+            for word_index, letter_index in self._cell_words.get(coord, []):
+                if word_index == index:
+                    continue
+                existing_letter = self.words[word_index].word[letter_index]
+                if letter != ' ' and existing_letter != ' ' and letter != existing_letter:
+                    raise ValueError(
+                        f"Letter conflict at position {coord}: "
+                        f"'{letter}' vs '{existing_letter}'"
+                    )
+
+        word.word = letters
+        word.clue = clue
+        self._layout = None
+        self._version += 1
+        for coord in coords:
+            # A blank letter never hides a letter supplied by a crossing word
+            cell_letters = [self.words[w].word[i] for w, i in self._cell_words[coord]]
+            self._set_cell(coord, next((c for c in cell_letters if c != ' '), ' '))
         
         
     def _initialize_grid(self):
         """Initialize an empty grid with spaces."""
-        print("Initializing grid with width: ", self.width, " and height: ", self.height)
+        logger.debug("Initializing grid with width: %d and height: %d", self.width, self.height)
         return [[' ' for _ in range(self.width)] for _ in range(self.height)]
 
     def _fill_grid_with_words(self, grid):
         """Place all words in the grid."""
-        print("Filling grid with words, we have ", len(self.words), " words")
+        logger.debug("Filling grid with words, we have %d words", len(self.words))
         for word in self.words:
             x, y = word.pos_x, word.pos_y
             for letter in word.word:
                 if 0 <= x < self.width and 0 <= y < self.height:
-                    grid[y][x] = letter
+                    if letter != ' ' or grid[y][x] == ' ':
+                        grid[y][x] = letter
                     if word.direction == Direction.ACROSS:
                         x += 1
                     else:  # Direction.DOWN
                         y += 1
         return grid
 
-    def _print_coordinates_header(self):
-        """Print the x-coordinates header."""
-        print('   ', end='')
-        for x in range(self.width):
-            print(f'{x:2}', end='')
-        print()
-
-    def _print_horizontal_border(self):
-        """Print horizontal border of the grid."""
-        print('  ' + '-' * (self.width * 2 + 1))
-
-    def _print_grid_rows(self, grid):
-        """Print the grid rows with y-coordinates."""
-        for y, row in enumerate(grid):
-            print(f'{y:2}|', end=' ')
-            for cell in row:
-                print(cell, end=' ')
-            print('|')
-
-    def _get_sorted_clues(self):
-        """Get sorted lists of across and down clues."""
-        across_clues = []
-        down_clues = []
-        
-        for word in self.words:
-            clue_text = f"{word.word} - {word.clue}" if word.clue else word.word
-            if word.direction == Direction.ACROSS:
-                across_clues.append(f"({word.pos_x}, {word.pos_y}) {clue_text}")
-            else:
-                down_clues.append(f"({word.pos_x}, {word.pos_y}) {clue_text}")
-        
-        return across_clues, down_clues
-
-    def _print_clues(self, across_clues, down_clues):
-        """Print the across and down clues."""
-        print("\nClues:")
-        if across_clues:
-            print("\nAcross:")
-            for clue in across_clues:
-                print(f"  {clue}")
-        
-        if down_clues:
-            print("\nDown:")
-            for clue in down_clues:
-                print(f"  {clue}")
+    def cells(self) -> dict[tuple[int, int], str]:
+        """Return the letter of every filled cell keyed by (x, y), blanks included. Do not mutate it."""
+        return self._cells
+
+    def words_at(self, x: int, y: int) -> list[tuple[int, int]]:
+        """Return (word index, letter index) of every word covering a cell, empty for an unused cell."""
+        return self._cell_words.get((x, y), [])
+
+    def cell_words(self) -> dict[tuple[int, int], list[tuple[int, int]]]:
+        """Return words_at for every filled cell, keyed by (x, y). Do not mutate it."""
+        return self._cell_words
+
+    def word_coordinates(self, word: Word) -> list[tuple[int, int]]:
+        """Return the (x, y) of every letter of a word, in order."""
+        return self._get_word_coordinates(word)
+
+    def add_slot(self, word: Word) -> None:
+        """
+        Add a word without add_word's checks, for layouts built elsewhere whose words
+        may touch, such as a saved crossword being loaded.
+        """
+        self.words.append(word)
+        self._index_word(word)
+
+    def get_grid(self) -> list[list[str]]:
+        """Return the cached solution grid, building it once on first use. Do not mutate it."""
+        if self._grid is None:
+            grid = self._initialize_grid()
+            self._grid = self._fill_grid_with_words(grid)
+        return self._grid
+
+    def get_layout(self) -> GridLayout:
+        """
+        Return the black/white mask, standard clue numbering and the across/down clue
+        lists, built together in one pass over the occupancy index and word starts and
+        cached until the next add_word or update_word. Do not mutate it.
+        """
+        if self._layout is None:
+            is_black = [[True] * self.width for _ in range(self.height)]
+            for x, y in self._cells:
+                if 0 <= x < self.width and 0 <= y < self.height:
+                    is_black[y][x] = False
+
+            # Cells where a word starts are numbered in reading order
+            numbers = [[0] * self.width for _ in range(self.height)]
+            for number, (y, x) in enumerate(sorted({(word.pos_y, word.pos_x) for word in self.words}), 1):
+                numbers[y][x] = number
+
+            across, down = [], []
+            for index, word in enumerate(self.words):
+                clue = Clue(
+                    number=numbers[word.pos_y][word.pos_x],
+                    direction=word.direction,
+                    clue=word.clue,
+                    length=len(word.word),
+                    word_index=index,
+                )
+                (across if word.direction == Direction.ACROSS else down).append(clue)
+            across.sort(key=lambda clue: clue.number)
+            down.sort(key=lambda clue: clue.number)
+            self._layout = GridLayout(is_black=is_black, numbers=numbers, across=across, down=down)
+        return self._layout
 
     def print_crossword(self):
-        """Print the complete crossword puzzle with grid and clues."""
-        grid = self._initialize_grid()
-        grid = self._fill_grid_with_words(grid)
-        
-        self._print_coordinates_header()
-        self._print_horizontal_border()
-        self._print_grid_rows(grid)
-        self._print_horizontal_border()
-        
-        across_clues, down_clues = self._get_sorted_clues()
-        self._print_clues(across_clues, down_clues)
+        """Log the complete crossword puzzle with grid and clues at INFO level."""
+        logger.info("Crossword:\n%s", render(self, "text"))
 
     def get_crossword_string(self) -> str:
-        """Return the complete crossword puzzle with grid and clues as a string."""
-        lines = []
-        grid = self._initialize_grid()
-        grid = self._fill_grid_with_words(grid)
-        
-        # Add coordinates header
-        header = '   '
-        header += ''.join(f'{x:2}' for x in range(self.width))
-        lines.append(header)
-        
-        # Add horizontal border
-        border = '  ' + '-' * (self.width * 2 + 1)
-        lines.append(border)
-        
-        # Add grid rows
-        for y, row in enumerate(grid):
-            grid_line = f'{y:2}|'
-            grid_line += ' '.join(cell for cell in row)
-            grid_line += ' |'
-            lines.append(grid_line)
-        
-        # Add bottom border
-        lines.append(border)
-        
-        # Add clues
-        across_clues, down_clues = self._get_sorted_clues()
-        
-        lines.append("\nClues:")
-        if across_clues:
-            lines.append("\nAcross:")
-            for clue in across_clues:
-                lines.append(f"  {clue}")
-        
-        if down_clues:
-            lines.append("\nDown:")
-            for clue in down_clues:
-                lines.append(f"  {clue}")
-        
-        return '\n'.join(lines)
+        """Return the complete crossword puzzle with grid and clues as a string, cached until it changes."""
+        return render(self, "text")
 
     def get_letter_constraints_for_word(self, new_word: Word) -> LetterConstraint:
         """
         Returns a LetterConstraint for 'new_word' by scanning the current Crossword grid
         to see if any letters are already fixed at the positions where 'new_word' would go.
         """
-        # Create a fresh grid that includes all previously added words.
-        grid = self._initialize_grid()
-        grid = self._fill_grid_with_words(grid)
+        # Read the cached grid that includes all previously added words.
+        grid = self.get_grid()
 
         # Prepare a blank constraint list for the new word (all None initially).
         constraints = [None] * len(new_word.word)
@@ -257,11 +502,11 @@ class Crossword(rx.Base):
         # Build and return a LetterConstraint object.
         return LetterConstraint(constraints)
 
-def create_crossword():
-    print("Creating crossword")
+def create_crossword() -> Crossword:
     """
     Not used by reflex, only for testing stuff
     """
+    logger.debug("Creating crossword")
     width = 20
     height = 10
     crossword = Crossword(width=width, height=height)
@@ -269,7 +514,7 @@ def create_crossword():
     words = generate_word_pattern(width, height, 1)
     for word in words:
         crossword.add_word(word)
-        print(word.word)
+        logger.debug("Added %s", word.word)
     """
     crossword.add_word(Word("Strawberry", pos_x=0, pos_y=0, direction=Direction.ACROSS, 
                            clue="Sweet red fruit"))
@@ -280,115 +525,48 @@ def create_crossword():
     crossword.add_word(Word("New", pos_x=5, pos_y=2, direction=Direction.ACROSS, 
                            clue="Not old"))
     """
-    crossword.print_crossword()
-    
+    return crossword
+
+
+@metrics.timed("layout.duration")
 def generate_word_pattern(width: int, height: int, num_words: int) -> list[Word]:
-    """Generate a pattern of intersecting words suitable for a crossword puzzle."""
-    words = []
+    """
+    Generate a pattern of intersecting words suitable for a crossword puzzle.
+
+    The layout is built in one Crossword whose occupancy index is updated as words
+    are placed. For a random parent word all legal crossing placements are enumerated
+    and one is sampled, so no attempt is wasted; parents without any legal placement
+    are skipped, and generation stops early once no word has one.
+    """
     min_word_length = 3
     max_word_length = 8
+    crossword = Crossword(width, height)
     
     # Place first word near the center
-    first_word_length = random.randint(5, max_word_length)
+    first_word_length = random.randint(5, min(max_word_length, width))
     middle_y = height // 4
     start_x = (width - first_word_length) // 2
-    
-    words.append(Word("-" * first_word_length, start_x, middle_y, Direction.ACROSS))
-    print(f"First word length: {first_word_length}")
+    crossword.add_word(Word("-" * first_word_length, start_x, middle_y, Direction.ACROSS))
+
     attempts = 0
-    max_attempts = 1000
-    
-    def would_extend_existing_word(new_word: Word) -> bool:
-        """Check if the new word would extend an existing word."""
-        new_coords = set([(x, y) for x, y in crossword._get_word_coordinates(new_word)])
-        
-        # Check one position before and after each existing word
-        for word in words:
-            if word.direction == Direction.ACROSS:
-                start_x = word.pos_x - 1
-                end_x = word.pos_x + len(word.word)
-                y = word.pos_y
-                if (start_x, y) in new_coords or (end_x, y) in new_coords:
-                    return True
-            else:  # Direction.DOWN
-                start_y = word.pos_y - 1
-                end_y = word.pos_y + len(word.word)
-                x = word.pos_x
-                if (x, start_y) in new_coords or (x, end_y) in new_coords:
-                    return True
-        return False
-    
-    while len(words) < num_words and attempts < max_attempts:
-        print(f"Attempts: {attempts}")
-        parent_word = random.choice(words)
-        new_direction = Direction.DOWN if parent_word.direction == Direction.ACROSS else Direction.ACROSS
-        intersect_pos = random.randint(0, len(parent_word.word) - 1)
-        
-        # Calculate new word position
-        if new_direction == Direction.ACROSS:
-            new_y = parent_word.pos_y + (0 if parent_word.direction == Direction.ACROSS else intersect_pos)
-            max_x = width - min_word_length
-            possible_x = list(range(max(0, parent_word.pos_x - max_word_length + 1), max_x + 1))
-            if possible_x:
-                new_x = random.choice(possible_x)
-                max_length = min(width - new_x, max_word_length)
-            else:
-                attempts += 1
-                continue
-        else:  # Direction.DOWN
-            new_x = parent_word.pos_x + (0 if parent_word.direction == Direction.DOWN else intersect_pos)
-            max_y = height - min_word_length
-            possible_y = list(range(max(0, parent_word.pos_y - max_word_length + 1), max_y + 1))
-            if possible_y:
-                new_y = random.choice(possible_y)
-                max_length = min(height - new_y, max_word_length)
-            else:
-                attempts += 1
-                continue
-        
-        # Try different word lengths
-        word_length = random.randint(min_word_length, max_length)
-        temp_word = Word("-" * word_length, new_x, new_y, new_direction)
-        print(f"New word length: {word_length}") 
-        try:
-            # Create temporary crossword for validation
-            crossword = Crossword(width, height)
-            for existing_word in words:
-                crossword.add_word(existing_word)
-            
-            # Check if word would extend any existing words
-            if would_extend_existing_word(temp_word):
-                attempts += 1
-                continue
-                
-            crossword.add_word(temp_word)
-            
-            # Check spacing between parallel words
-            has_proper_spacing = True
-            for word in words:
-                if word.direction == temp_word.direction:
-                    if word.direction == Direction.ACROSS:
-                        if abs(word.pos_y - temp_word.pos_y) == 1:
-                            has_proper_spacing = False
-                            break
-                    else:  # Direction.DOWN
-                        if abs(word.pos_x - temp_word.pos_x) == 1:
-                            has_proper_spacing = False
-                            break
-            
-            if has_proper_spacing:
-                words.append(temp_word)
-                attempts = 0  # Reset attempts after successful placement
-            else:
-                attempts += 1
-                
-        except ValueError:
+    while len(crossword.words) < num_words:
+        parents = list(crossword.words)
+        random.shuffle(parents)
+        for parent_word in parents:
             attempts += 1
-            continue
-            
-    return words
+            placements = crossword.get_crossing_placements(parent_word, min_word_length, max_word_length)
+            if placements:
+                crossword.add_word(random.choice(placements))
+                break
+        else:
+            break
+
+    metrics.increment("layout.attempts", attempts)
+    metrics.increment("layout.words", len(crossword.words))
+    logger.debug("Generated word pattern with %d of %d words", len(crossword.words), num_words)
+    return crossword.words
 if __name__ == "__main__":
-    create_crossword()
+    print(create_crossword().get_crossword_string())
     
         
 
@@ -0,0 +1,107 @@
+import logging
+import os
+
+from .blocked import build_blocked_crossword
+from .fill import fill_crossword
+from .generate import LetterConstraint, generate_clue, generate_puzzle_words, generate_words
+from .layout import generate_best_word_pattern
+from .lexicon import load_lexicon
+from .model import Crossword, generate_word_pattern
+
+# Optional word list for the offline fill engine, plain text or compiled with crossy.lexicon
+WORD_LIST_PATH = os.environ.get("CROSSY_WORD_LIST", "")
+# Candidate words requested per LLM call, validated locally
+WORD_CANDIDATES = 5
+# Seconds spent picking the best of many layouts across all cores; 0 takes the first layout
+LAYOUT_TIME_BUDGET = float(os.environ.get("CROSSY_LAYOUT_BUDGET", "0"))
+# Layout engine: "freeform" words crossing on an open grid, or a "blocked" symmetric grid
+# with black squares like a published crossword, where num_words is not used
+LAYOUTS = ("freeform", "blocked")
+LAYOUT = os.environ.get("CROSSY_LAYOUT", "freeform")
+
+logger = logging.getLogger(__name__)
+
+
+def build_crossword_layout(
+    width: int,
+    height: int,
+    num_words: int,
+    time_budget: float = LAYOUT_TIME_BUDGET,
+    layout: str = LAYOUT,
+) -> Crossword:
+    """Generate a word pattern with the given layout engine and place it in a new Crossword as blank slots."""
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}', expected one of {', '.join(LAYOUTS)}")
+    if layout == "blocked":
+        return build_blocked_crossword(width, height)
+    crossword = Crossword(width, height)
+    logger.debug("Generating word pattern")
+    if time_budget > 0:
+        word_pattern = generate_best_word_pattern(
+            width, height, num_words, time_budget=time_budget, lexicon_path=WORD_LIST_PATH
+        )
+    else:
+        word_pattern = generate_word_pattern(width, height, num_words)
+    logger.debug("Word pattern: %s", word_pattern)
+    for word in word_pattern:
+        # Replace dashes with spaces in the word pattern
+        word.word = word.word.replace("-", " ")
+        crossword.add_word(word)
+    return crossword
+
+
+def fill_crossword_words(
+    crossword: Crossword,
+    theme: str,
+    language: str,
+    word_list_path: str = WORD_LIST_PATH,
+    candidates: int = WORD_CANDIDATES,
+) -> None:
+    """Fill every slot of a layout with words and clues, locally when a word list is available."""
+    if word_list_path:
+        try:
+            # Fill the layout locally and only ask the LLM for clues the word list lacks
+            lexicon = load_lexicon(word_list_path)
+            fill_crossword(crossword, lexicon)
+            for index, word in enumerate(crossword.words):
+                clue = lexicon.clue(word.word) or generate_clue(theme, language, word.word).clue
+                crossword.update_word(index, word.word, clue)
+            return
+        except ValueError as e:
+            logger.warning("Local fill failed, falling back to generating words: %s", e)
+
+    # Ask for the whole puzzle at once, then fill whatever is left slot by slot
+    remaining = set(generate_puzzle_words(crossword, theme, language))
+
+    # Words in a wave share no cells, so they are generated concurrently and
+    # the next wave sees their letters as constraints
+    graph = crossword.get_slot_graph()
+    patterns = [crossword.get_letter_constraints_for_word(word).pattern for word in crossword.words]
+    for wave in crossword.get_fill_waves():
+        wave = [index for index in wave if index in remaining]
+        if not wave:
+            continue
+        slots = []
+        for index in wave:
+            word = crossword.words[index]
+            letter_constraints = LetterConstraint(list(patterns[index]))
+            logger.debug("Slot %d: %r, letter constraints: %s", index, word.word, letter_constraints)
+            slots.append((len(word.word), letter_constraints))
+
+        used_words = [word.word for word in crossword.words if word.word.strip()]
+        generated_words = generate_words(
+            theme, language, slots, exclude_words=used_words, candidates=candidates
+        )
+        for index, generated_word in zip(wave, generated_words):
+            logger.debug("Result: %s, clue: %s", generated_word.word, generated_word.clue)
+            crossword.update_word(index, generated_word.word, generated_word.clue)
+            # Only the crossing slots see the new letters, no need to rescan the grid
+            graph.propagate(index, crossword.words[index].word, patterns)
+
+
+def generate_puzzle(theme: str, language: str, width: int, height: int, num_words: int) -> Crossword:
+    """Build a layout and fill it with words and clues, ready to play."""
+    crossword = build_crossword_layout(width, height, num_words)
+    crossword.topic = theme
+    fill_crossword_words(crossword, theme, language)
+    return crossword
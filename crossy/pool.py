@@ -0,0 +1,106 @@
+import logging
+import os
+import queue
+import threading
+from collections import deque
+from typing import Callable
+
+from . import metrics
+from .bank import PuzzleBank
+from .model import Crossword
+from .pipeline import generate_puzzle
+
+# Ready-made puzzles kept per (theme, language, width, height); 0, the default, disables the pool
+POOL_SIZE = int(os.environ.get("CROSSY_POOL_SIZE", "0"))
+
+logger = logging.getLogger(__name__)
+
+PoolKey = tuple[str, str, int, int]
+
+
+class PuzzlePool:
+    """
+    Bounded pools of finished puzzles per (theme, language, width, height).
+
+    Background worker threads generate puzzles until every requested pool holds
+    `size` of them, and refill a pool whenever a puzzle is taken. A failed
+    generation is logged and not retried until the next get or warm for its key,
+    so a broken LLM connection does not keep the workers spinning. With a bank,
+    every generated puzzle is also stored there for later reuse.
+    """
+
+    def __init__(
+        self,
+        size: int = POOL_SIZE,
+        workers: int = 1,
+        generate: Callable[[str, str, int, int, int], Crossword] = generate_puzzle,
+        bank: PuzzleBank | None = None,
+    ):
+        self.size = size
+        self.workers = workers
+        self._generate = generate
+        self._bank = bank
+        self._puzzles: dict[PoolKey, deque[Crossword]] = {}
+        self._pending: dict[PoolKey, int] = {}
+        self._num_words: dict[PoolKey, int] = {}
+        self._queue: queue.Queue[PoolKey] = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+
+    def get(self, theme: str, language: str, width: int, height: int, num_words: int) -> Crossword | None:
+        """Take a finished puzzle from the pool, or return None if it is empty, and refill it."""
+        key = (theme, language, width, height)
+        with self._lock:
+            puzzles = self._puzzles.get(key)
+            crossword = puzzles.popleft() if puzzles else None
+        metrics.increment("pool.hits" if crossword is not None else "pool.misses")
+        self.warm(theme, language, width, height, num_words)
+        return crossword
+
+    def warm(self, theme: str, language: str, width: int, height: int, num_words: int) -> None:
+        """Start generating puzzles in the background until the pool for this key is full."""
+        key = (theme, language, width, height)
+        with self._lock:
+            self._num_words[key] = num_words
+            missing = self.size - len(self._puzzles.get(key, ())) - self._pending.get(key, 0)
+            if missing <= 0:
+                return
+            self._pending[key] = self._pending.get(key, 0) + missing
+            self._start_workers()
+        for _ in range(missing):
+            self._queue.put(key)
+
+    def available(self, theme: str, language: str, width: int, height: int) -> int:
+        """Number of finished puzzles ready for this key."""
+        with self._lock:
+            return len(self._puzzles.get((theme, language, width, height), ()))
+
+    def _start_workers(self) -> None:
+        # Daemon threads, so a half-finished puzzle never keeps the app from exiting
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name=f"puzzle-pool-{len(self._threads)}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _work(self) -> None:
+        while True:
+            key = self._queue.get()
+            crossword = None
+            try:
+                with metrics.timer("pool.generate_duration"):
+                    crossword = self._generate(*key, self._num_words[key])
+                metrics.increment("pool.generated")
+            except Exception:
+                metrics.increment("pool.failures")
+                logger.warning("Generating a puzzle for %s failed", key, exc_info=True)
+
+            if crossword is not None and self._bank is not None:
+                try:
+                    self._bank.add(crossword, key[0], key[1])
+                except Exception:
+                    logger.warning("Storing a puzzle for %s in the bank failed", key, exc_info=True)
+
+            with self._lock:
+                self._pending[key] -= 1
+                if crossword is not None:
+                    self._puzzles.setdefault(key, deque()).append(crossword)
@@ -0,0 +1,168 @@
+import json
+from typing import TYPE_CHECKING, Callable, Iterator
+from xml.sax.saxutils import escape
+
+from . import metrics
+
+if TYPE_CHECKING:
+    from .model import Crossword, Word
+
+# Size of the chunks iter_render yields for an already rendered puzzle
+CHUNK_SIZE = 64 * 1024
+
+# SVG cell size and grid line width in pixels
+SVG_CELL = 32
+SVG_BORDER = 2
+
+
+def _format_clue(word: "Word") -> str:
+    clue_text = f"{word.word} - {word.clue}" if word.clue else word.word
+    return f"({word.pos_x}, {word.pos_y}) {clue_text}"
+
+
+def iter_text(crossword: "Crossword") -> Iterator[str]:
+    """
+    The solution grid with coordinates and the clue list, as plain text. The agent
+    reads this format, so keep it stable: clues are in word order with start coordinates.
+    """
+    grid = crossword.get_grid()
+    border = "  " + "-" * (crossword.width * 2 + 1)
+    yield "   " + "".join(f"{x:2}" for x in range(crossword.width)) + "\n" + border + "\n"
+    for y, row in enumerate(grid):
+        yield f"{y:2}|" + " ".join(row) + " |\n"
+    yield border + "\n\nClues:"
+    for heading, direction in (("Across", "across"), ("Down", "down")):
+        words = [word for word in crossword.words if word.direction == direction]
+        if words:
+            yield f"\n\n{heading}:"
+            for word in words:
+                yield f"\n  {_format_clue(word)}"
+
+
+def iter_ipuz(crossword: "Crossword") -> Iterator[str]:
+    """
+    The puzzle as ipuz crossword JSON: "#" for blocks, clue numbers in "puzzle" and
+    the letters in "solution", where null is a cell whose letter is not known yet.
+    """
+    grid = crossword.get_grid()
+    layout = crossword.get_layout()
+    header = {
+        "version": "http://ipuz.org/v2",
+        "kind": ["http://ipuz.org/crossword#1"],
+        "title": crossword.topic,
+        "dimensions": {"width": crossword.width, "height": crossword.height},
+    }
+    # Written a row at a time, so a large puzzle never exists as one nested object
+    yield json.dumps(header)[:-1] + ', "puzzle": ['
+    for y in range(crossword.height):
+        row = ["#" if layout.is_black[y][x] else layout.numbers[y][x] for x in range(crossword.width)]
+        yield ("" if y == 0 else ", ") + json.dumps(row)
+    yield '], "solution": ['
+    for y, letters in enumerate(grid):
+        row = [
+            "#" if layout.is_black[y][x] else (letter if letter != " " else None)
+            for x, letter in enumerate(letters)
+        ]
+        yield ("" if y == 0 else ", ") + json.dumps(row)
+    clues = {
+        "Across": [[clue.number, clue.clue] for clue in layout.across],
+        "Down": [[clue.number, clue.clue] for clue in layout.down],
+    }
+    yield '], "clues": ' + json.dumps(clues) + "}"
+
+
+def iter_svg(crossword: "Crossword", solution: bool = False) -> Iterator[str]:
+    """The grid as a standalone SVG image with clue numbers, and the letters if solution is set."""
+    grid = crossword.get_grid()
+    layout = crossword.get_layout()
+    width = crossword.width * SVG_CELL + SVG_BORDER
+    height = crossword.height * SVG_CELL + SVG_BORDER
+    offset = SVG_BORDER / 2
+    yield (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="sans-serif">\n'
+        f'<rect width="{width}" height="{height}" fill="black"/>\n'
+    )
+    for y in range(crossword.height):
+        cells = []
+        for x in range(crossword.width):
+            if layout.is_black[y][x]:
+                continue
+            left, top = offset + x * SVG_CELL, offset + y * SVG_CELL
+            cells.append(
+                f'<rect x="{left}" y="{top}" width="{SVG_CELL}" height="{SVG_CELL}" '
+                f'fill="white" stroke="black"/>'
+            )
+            if layout.numbers[y][x]:
+                cells.append(
+                    f'<text x="{left + 2}" y="{top + 10}" font-size="9">{layout.numbers[y][x]}</text>'
+                )
+            if solution and grid[y][x] != " ":
+                cells.append(
+                    f'<text x="{left + SVG_CELL / 2}" y="{top + SVG_CELL * 0.75}" font-size="20" '
+                    f'text-anchor="middle">{escape(grid[y][x])}</text>'
+                )
+        if cells:
+            yield "\n".join(cells) + "\n"
+    yield "</svg>\n"
+
+
+FORMATS: dict[str, Callable[["Crossword"], Iterator[str]]] = {
+    "text": iter_text,
+    "ipuz": iter_ipuz,
+    "svg": iter_svg,
+    "svg_solution": lambda crossword: iter_svg(crossword, solution=True),
+}
+
+
+def _renderer(fmt: str) -> Callable[["Crossword"], Iterator[str]]:
+    try:
+        return FORMATS[fmt]
+    except KeyError:
+        raise ValueError(f"Unknown render format '{fmt}', expected one of {', '.join(FORMATS)}") from None
+
+
+def _cache_key(crossword: "Crossword") -> tuple[int, str]:
+    # The topic is a plain field that can be set at any time, so it is part of the key
+    return crossword._version, crossword.topic
+
+
+def render(crossword: "Crossword", fmt: str = "text") -> str:
+    """
+    Render a crossword in one of FORMATS. The output is cached on the crossword until
+    its words change, so rendering an unchanged puzzle again only costs a lookup.
+    """
+    renderer = _renderer(fmt)
+    key = _cache_key(crossword)
+    cached = crossword._renders.get(fmt)
+    if cached is not None and cached[0] == key:
+        metrics.increment("render.cache_hits")
+        return cached[1]
+    metrics.increment("render.cache_misses")
+    with metrics.timer("render.duration"):
+        output = "".join(renderer(crossword))
+    crossword._renders[fmt] = (key, output)
+    return output
+
+
+def iter_render(crossword: "Crossword", fmt: str = "text", chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Yield a rendered crossword piece by piece, e.g. for a streaming HTTP response. A
+    cached render is sliced into chunk_size pieces; otherwise pieces are yielded as
+    they are rendered and the output is cached once the last one has been consumed.
+    """
+    renderer = _renderer(fmt)
+    key = _cache_key(crossword)
+    cached = crossword._renders.get(fmt)
+    if cached is not None and cached[0] == key:
+        metrics.increment("render.cache_hits")
+        output = cached[1]
+        for start in range(0, len(output), chunk_size):
+            yield output[start:start + chunk_size]
+        return
+    metrics.increment("render.cache_misses")
+    parts = []
+    for part in renderer(crossword):
+        parts.append(part)
+        yield part
+    crossword._renders[fmt] = (key, "".join(parts))
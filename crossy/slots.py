@@ -0,0 +1,84 @@
+import heapq
+from typing import Iterable, Iterator
+
+# A letter pattern per slot as in LetterConstraint.pattern: a letter, or None where it is open
+Pattern = list[str | None]
+
+
+class SlotGraph:
+    """
+    Crossing graph of a crossword's slots (its words, by index).
+
+    edges[slot] lists (letter index, other slot, other letter index) for every cell the
+    slot shares, so the crossings of a slot are found in O(degree) instead of by
+    scanning coordinates. Built once from the occupancy index by
+    Crossword.get_slot_graph and kept until a word is added; filling words in does not
+    change it.
+    """
+
+    def __init__(self, lengths: list[int], cell_words: dict[tuple[int, int], list[tuple[int, int]]]):
+        self.lengths = lengths
+        self.edges: list[list[tuple[int, int, int]]] = [[] for _ in lengths]
+        for covering in cell_words.values():
+            for slot, index in covering:
+                for other, other_index in covering:
+                    if slot != other:
+                        self.edges[slot].append((index, other, other_index))
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def degree(self, slot: int) -> int:
+        """Number of crossings of a slot."""
+        return len(self.edges[slot])
+
+    def crossings(self) -> Iterator[tuple[int, int, int, int]]:
+        """Yield (slot, letter index, other slot, other letter index) for every crossing, both ways round."""
+        for slot, edges in enumerate(self.edges):
+            for index, other, other_index in edges:
+                yield slot, index, other, other_index
+
+    def propagate(self, slot: int, letters: str, patterns: list[Pattern]) -> list[int]:
+        """
+        Write the letters filled into a slot into the patterns of its crossing slots,
+        blanks as None, and return the slots whose pattern was written to.
+        """
+        changed = []
+        for index, other, other_index in self.edges[slot]:
+            letter = letters[index]
+            patterns[other][other_index] = letter if letter != " " else None
+            changed.append(other)
+        return changed
+
+    def fill_order(self, patterns: list[Pattern], slots: Iterable[int] | None = None) -> list[int]:
+        """
+        Order slots most constrained first: the largest share of known letters, then the
+        most crossings. Every slot taken counts as filled, so the letters it shares become
+        known in its crossing slots, updated in O(degree) per slot. Defaults to the slots
+        whose pattern still has an open letter.
+        """
+        if slots is None:
+            slots = [slot for slot, pattern in enumerate(patterns) if None in pattern]
+        known: dict[int, set[int]] = {
+            slot: {i for i, letter in enumerate(patterns[slot]) if letter is not None} for slot in slots
+        }
+
+        def key(slot: int) -> tuple[float, int, int]:
+            return -len(known[slot]) / self.lengths[slot], -self.degree(slot), slot
+
+        # Keys only ever improve, so stale heap entries are skipped rather than removed
+        heap = [key(slot) for slot in known]
+        heapq.heapify(heap)
+        order = []
+        taken = set()
+        while heap:
+            *_, slot = heapq.heappop(heap)
+            if slot in taken:
+                continue
+            taken.add(slot)
+            order.append(slot)
+            for _, other, other_index in self.edges[slot]:
+                if other in known and other not in taken and other_index not in known[other]:
+                    known[other].add(other_index)
+                    heapq.heappush(heap, key(other))
+        return order
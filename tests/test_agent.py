@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+pytest.importorskip("swarm")
+
+from crossy.agent import AgentExecutor
+from crossy.model import Crossword
+
+
+def _placements(*placements: tuple[str, int, int, str]) -> str:
+    return json.dumps([
+        {"word": word, "row": row, "column": column, "direction": direction}
+        for word, row, column, direction in placements
+    ])
+
+
+def test_add_words_applies_a_legal_batch():
+    executor = AgentExecutor(Crossword(7, 7))
+    response = json.loads(executor.add_words(_placements(("PIZZA", 1, 3, "across"), ("PASTA", 5, 2, "down"))))
+
+    assert response["applied"]
+    assert [word.word for word in executor.crossword.words] == ["PIZZA", "PASTA"]
+
+
+def test_add_words_applies_nothing_if_one_placement_fails():
+    executor = AgentExecutor(Crossword(7, 7))
+    executor.add_word("PIZZA", 1, 3, "across")
+    before = executor.crossword.to_bytes()
+
+    # The second word crosses PIZZA at a letter it does not share
+    response = json.loads(executor.add_words(_placements(("PASTA", 5, 2, "down"), ("BREAD", 1, 0, "down"))))
+
+    assert not response["applied"]
+    assert [result["result"] for result in response["results"]] == ["ok", "error"]
+    assert executor.crossword.to_bytes() == before
+
+
+def test_add_words_rejects_malformed_json():
+    executor = AgentExecutor(Crossword(7, 7))
+    response = json.loads(executor.add_words('{"word": "PIZZA"}'))
+
+    assert not response["applied"]
+    assert executor.crossword.words == []
@@ -0,0 +1,72 @@
+import multiprocessing
+import random
+
+from crossy.bank import PuzzleBank
+from crossy.model import Crossword, Direction, Word
+
+
+def _puzzle(letters: str, clue: str) -> Crossword:
+    crossword = Crossword(10, 5)
+    crossword.topic = "Food"
+    crossword.add_word(Word(letters, 1, 2, Direction.ACROSS, clue))
+    return crossword
+
+
+def test_add_get_and_find(tmp_path):
+    bank = PuzzleBank(str(tmp_path / "puzzles.bank"))
+    pizza = _puzzle("PIZZA", "Italian dish")
+    pasta = _puzzle("PASTA", "Noodles")
+    pizza_id = bank.add(pizza, "Food", "English")
+    bank.add(pasta, " food ", "ENGLISH", difficulty=2)
+
+    assert bank.get(pizza_id).to_bytes() == pizza.to_bytes()
+    assert bank.get(12345) is None
+    assert bank.count("Food", "English", 10, 5) == 2
+    assert bank.count("Food", "English", 10, 5, difficulty=2) == 1
+    assert bank.find("Food", "English", 10, 5, difficulty=2).to_bytes() == pasta.to_bytes()
+    found = {bank.find("Food", "English", 10, 5, rng=random.Random(seed)).to_bytes() for seed in range(20)}
+    assert found == {pizza.to_bytes(), pasta.to_bytes()}
+    assert bank.find("Food", "Swedish", 10, 5) is None
+    assert bank.find("Food", "English", 20, 5) is None
+    bank.close()
+
+
+def test_reopen(tmp_path):
+    path = str(tmp_path / "puzzles.bank")
+    bank = PuzzleBank(path)
+    puzzle_id = bank.add(_puzzle("TACOS", "Folded tortillas"), "Food", "English")
+    bank.close()
+
+    bank = PuzzleBank(path)
+    assert bank.get(puzzle_id).words[0].word == "TACOS"
+    second_id = bank.add(_puzzle("SUSHI", "Rice rolls"), "Food", "English")
+    assert bank.get(second_id).words[0].word == "SUSHI"
+    assert bank.get(puzzle_id).words[0].word == "TACOS"
+    bank.close()
+
+
+def _append(path: str, letters: str) -> None:
+    bank = PuzzleBank(path)
+    for _ in range(100):
+        bank.add(_puzzle(letters, letters.title()), "Food", "English")
+    bank.close()
+
+
+def test_processes_share_a_bank(tmp_path):
+    path = str(tmp_path / "puzzles.bank")
+    PuzzleBank(path).close()
+    processes = [
+        multiprocessing.Process(target=_append, args=(path, letters)) for letters in ["PIZZA", "PASTA", "TACOS", "SUSHI"]
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    bank = PuzzleBank(path)
+    assert bank.count("Food", "English", 10, 5) == 400
+    words = [bank.get(puzzle_id).words[0] for puzzle_id in range(1, 401)]
+    assert all(word.clue == word.word.title() for word in words)
+    assert sorted({word.word for word in words}) == ["PASTA", "PIZZA", "SUSHI", "TACOS"]
+    bank.close()
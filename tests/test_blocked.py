@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from crossy.blocked import _run_length, generate_blocked_mask, slots_from_mask
+from crossy.model import Direction
+from crossy.pipeline import build_crossword_layout
+
+SIZES = [(15, 15, seed) for seed in range(5)] + [(21, 21, seed) for seed in range(3)] + [(12, 9, 0)]
+
+
+def _mask(width: int, height: int, seed: int) -> list[list[bool]]:
+    return generate_blocked_mask(width, height, rng=random.Random(seed))
+
+
+def _runs(line: list[bool]) -> list[int]:
+    runs, run = [], 0
+    for block in line + [True]:
+        if block:
+            if run:
+                runs.append(run)
+            run = 0
+        else:
+            run += 1
+    return runs
+
+
+@pytest.mark.parametrize("width,height,seed", SIZES)
+def test_mask_is_symmetric(width, height, seed):
+    mask = _mask(width, height, seed)
+    assert [row[::-1] for row in mask[::-1]] == mask
+
+
+@pytest.mark.parametrize("width,height,seed", SIZES)
+def test_mask_runs_are_long_enough(width, height, seed):
+    mask = _mask(width, height, seed)
+    columns = [[row[x] for row in mask] for x in range(width)]
+    assert all(run >= 3 for line in mask + columns for run in _runs(line))
+
+
+@pytest.mark.parametrize("width,height,seed", SIZES)
+def test_mask_white_cells_are_connected(width, height, seed):
+    mask = _mask(width, height, seed)
+    white = {(x, y) for y in range(height) for x in range(width) if not mask[y][x]}
+    start = next(iter(white))
+    seen, stack = {start}, [start]
+    while stack:
+        x, y = stack.pop()
+        for cell in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if cell in white and cell not in seen:
+                seen.add(cell)
+                stack.append(cell)
+    assert seen == white
+
+
+@pytest.mark.parametrize("width,height,seed", SIZES)
+def test_slots_cover_every_white_cell_once_each_way(width, height, seed):
+    mask = _mask(width, height, seed)
+    covered = {Direction.ACROSS: [], Direction.DOWN: []}
+    for slot in slots_from_mask(mask):
+        dx, dy = (1, 0) if slot.direction == Direction.ACROSS else (0, 1)
+        assert len(slot.word) == _run_length(mask, slot.pos_x, slot.pos_y, dx, dy)
+        covered[slot.direction].extend((slot.pos_x + dx * i, slot.pos_y + dy * i) for i in range(len(slot.word)))
+
+    white = sorted((x, y) for y in range(height) for x in range(width) if not mask[y][x])
+    assert sorted(covered[Direction.ACROSS]) == white
+    assert sorted(covered[Direction.DOWN]) == white
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_default_21x21_grid_has_140_slots(seed):
+    assert len(slots_from_mask(_mask(21, 21, seed))) >= 140
+
+
+def test_blocked_layout_option():
+    crossword = build_crossword_layout(15, 15, 0, layout="blocked")
+    layout = crossword.get_layout()
+    assert any(any(row) for row in layout.is_black)
+    assert all(word.word.strip() == "" for word in crossword.words)
+
+    with pytest.raises(ValueError):
+        build_crossword_layout(15, 15, 0, layout="diagonal")
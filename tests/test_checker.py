@@ -0,0 +1,32 @@
+from crossy.checker import AnswerChecker
+from crossy.model import Crossword, Direction, Word
+
+
+def test_checker_tracks_words_and_solution():
+    crossword = Crossword(5, 5)
+    crossword.add_word(Word("CAT", 0, 0, Direction.ACROSS))
+    crossword.add_word(Word("COW", 0, 0, Direction.DOWN))
+    checker = AnswerChecker(crossword)
+    assert checker.words_at(0, 0) == [0, 1]
+
+    for x, letter in enumerate("CAT"):
+        checker.set_letter(x, 0, letter.lower())
+    assert checker.is_word_correct(0)
+    assert checker.word_progress(1) == (1, 3)
+    assert not checker.is_solved()
+
+    checker.set_letter(0, 1, "X")
+    assert checker.wrong == {(0, 1)}
+    checker.set_letter(0, 1, "O")
+    checker.set_letter(0, 2, "W")
+    assert checker.wrong == set()
+    assert checker.solved_words == 2
+    assert checker.is_solved()
+
+    checker.set_letter(0, 0, "")
+    assert checker.solved_words == 0
+    assert not checker.is_solved()
+
+
+def test_empty_crossword_is_not_solved():
+    assert not AnswerChecker(Crossword(5, 5)).is_solved()
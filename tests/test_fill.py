@@ -0,0 +1,47 @@
+import pytest
+
+from crossy.fill import fill_crossword
+from crossy.model import Crossword, Direction, Word
+
+
+def _corner() -> Crossword:
+    """A 3-letter across slot and a 4-letter down slot sharing their first cell."""
+    crossword = Crossword(5, 5)
+    crossword.add_word(Word("   ", 0, 0, Direction.ACROSS))
+    crossword.add_word(Word("    ", 0, 0, Direction.DOWN))
+    return crossword
+
+
+def test_fill_crossword():
+    crossword = _corner()
+    fill_crossword(crossword, ["ABC", "XBC", "XYZW", "QRST"])
+    assert [word.word for word in crossword.words] == ["XBC", "XYZW"]
+
+
+def test_fill_keeps_existing_letters():
+    crossword = _corner()
+    crossword.update_word(1, "Q   ")
+    fill_crossword(crossword, ["ABC", "QBC", "XYZW", "QRST"])
+    assert [word.word for word in crossword.words] == ["QBC", "QRST"]
+
+
+def test_fill_without_solution_leaves_crossword_unchanged():
+    crossword = _corner()
+    with pytest.raises(ValueError, match="No fill exists"):
+        fill_crossword(crossword, ["ABC", "XYZW", "QYZW"])
+    assert [word.word for word in crossword.words] == ["   ", "    "]
+
+
+def test_fill_gives_up_after_max_backtracks():
+    # Forward checking rejects ABC without placing it, which is not a backtrack
+    with pytest.raises(ValueError, match="No fill exists"):
+        fill_crossword(_corner(), ["ABC", "XYZW", "QYZW"], max_backtracks=0)
+
+    # ABC fits both slots but can only be used once, so placing it has to be undone
+    crossword = Crossword(5, 5)
+    crossword.add_word(Word("   ", 0, 0, Direction.ACROSS))
+    crossword.add_word(Word("   ", 0, 0, Direction.DOWN))
+    with pytest.raises(ValueError, match="0 backtracks"):
+        fill_crossword(crossword, ["ABC"], max_backtracks=0)
+    with pytest.raises(ValueError, match="No fill exists"):
+        fill_crossword(crossword, ["ABC"], max_backtracks=1)
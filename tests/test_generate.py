@@ -0,0 +1,71 @@
+import pytest
+
+from crossy import generate, llm
+from crossy.cache import WordCache
+from crossy.generate import LetterConstraint, WordReservations, generate_words
+from crossy.llm import FakeClient, set_client
+
+WORDS = ["PIZZA", "PASTA", "PAELLA", "SALSA", "SUSHI", "TACOS"]
+
+
+@pytest.fixture
+def fake_client():
+    previous = llm._client
+    client = FakeClient(WORDS, seed=1)
+    set_client(client)
+    yield client
+    set_client(previous)
+
+
+@pytest.mark.parametrize("candidates", [1, 3])
+def test_generate_words_never_repeats_a_word(monkeypatch, fake_client, candidates):
+    monkeypatch.setattr(generate, "word_cache", None)
+    slots = [(5, LetterConstraint.from_string("P____"))] * 2
+    words = generate_words("Food", "English", slots, candidates=candidates)
+    assert sorted(word.word for word in words) == ["PASTA", "PIZZA"]
+
+
+def test_generate_words_never_repeats_a_cached_word(monkeypatch, tmp_path, fake_client):
+    cache = WordCache(str(tmp_path / "words.db"))
+    cache.put("Food", "English", "PIZZA", "Italian dish")
+    monkeypatch.setattr(generate, "word_cache", cache)
+    slots = [(5, LetterConstraint.from_string("P____"))] * 2
+    words = generate_words("Food", "English", slots, exclude_words=["SUSHI"])
+    assert sorted(word.word for word in words) == ["PASTA", "PIZZA"]
+
+
+def test_word_reservations():
+    reserved = WordReservations(["pizza"])
+    assert not reserved.reserve("PIZZA")
+    assert reserved.reserve("pasta")
+    assert not reserved.reserve("Pasta")
+    assert reserved.words() == ["PASTA", "PIZZA"]
+
+
+def test_cache_eviction_counts_rows_of_all_processes(tmp_path):
+    path = str(tmp_path / "words.db")
+    first = WordCache(path, max_entries=3)
+    second = WordCache(path, max_entries=3)
+    for word in ["PIZZA", "PASTA"]:
+        first.put("Food", "English", word, "")
+    for word in ["SALSA", "SUSHI"]:
+        second.put("Food", "English", word, "")
+    # Within its own running count of three, so the first connection does not evict yet
+    first.put("Food", "English", "TACOS", "")
+    assert first._connection.execute("SELECT COUNT(*) FROM words").fetchone()[0] == 5
+
+    first.put("Food", "English", "PAELLA", "")
+    assert first._connection.execute("SELECT COUNT(*) FROM words").fetchone()[0] == 3
+    # The three least recently used words are gone, including those the other connection added
+    assert [first.get("Food", "English", word) for word in ["PIZZA", "PASTA", "SALSA"]] == [None] * 3
+    assert second.get("Food", "English", "TACOS") == ("TACOS", "")
+
+
+def test_cache_evicts_in_batches(tmp_path):
+    path = str(tmp_path / "words.db")
+    cache = WordCache(path, max_entries=200)
+    for i in range(201):
+        cache.put("Food", "English", f"WORD{i}", "")
+    # One word over the limit evicts it and a further 1% of the limit
+    assert cache._connection.execute("SELECT COUNT(*) FROM words").fetchone()[0] == 198
+    assert WordCache(path, max_entries=200)._count == 198
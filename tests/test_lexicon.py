@@ -0,0 +1,72 @@
+from crossy.lexicon import Lexicon, MappedLexicon, compile_lexicon, load_lexicon
+
+WORD_LIST = ["pizza", "pasta", "tacos", "cat", "car", "äpple", "oat"]
+WORDS = [
+    ("pizza", "Italian dish", 5.0),
+    ("pasta", "", 9.0),
+    ("tacos", "Folded tortillas", 0.0),
+    ("cat", "", 0.0),
+    ("car", "Vehicle", 3.0),
+    ("äpple", "Swedish fruit", 1.0),
+    ("oat", "", 0.0),
+]
+
+
+def test_lexicon_matches_patterns():
+    lexicon = Lexicon(WORD_LIST)
+    assert lexicon.match("_____") == ["PIZZA", "PASTA", "TACOS", "ÄPPLE"]
+    assert lexicon.match("_A___") == ["PASTA", "TACOS"]
+    assert lexicon.match("_A_") == ["CAT", "CAR", "OAT"]
+    assert lexicon.count("__T") == 2
+    assert lexicon.match("XYZ") == lexicon.match("____") == []
+    assert "CAR" in lexicon and "DOG" not in lexicon
+
+
+def test_lexicon_skips_duplicates_and_non_words(tmp_path):
+    source = tmp_path / "words.txt"
+    source.write_text("# test words\ncat\n\nCat\nc-t\noat\n")
+    lexicon = load_lexicon(str(source))
+    assert len(lexicon) == 2
+    assert lexicon.match("___") == ["CAT", "OAT"]
+
+
+def test_lexicon_keeps_first_clue_of_duplicates(tmp_path):
+    source = tmp_path / "words.txt"
+    source.write_text("cat\tPet\t5\ncat\tTractor brand\t1\noat\t\t2\noat\tGrain\t1\n")
+    target = tmp_path / "words.lex"
+    compile_lexicon(str(source), str(target))
+    for lexicon in (load_lexicon(str(source)), MappedLexicon(str(target))):
+        assert lexicon.clue("CAT") == "Pet"
+        assert lexicon.clue("OAT") == ""
+
+
+def _write_words(path) -> None:
+    path.write_text("# test words\n" + "".join(f"{word}\t{clue}\t{frequency}\n" for word, clue, frequency in WORDS))
+
+
+def test_mapped_lexicon_matches_lexicon(tmp_path):
+    source = tmp_path / "words.txt"
+    target = tmp_path / "words.lex"
+    _write_words(source)
+    compile_lexicon(str(source), str(target))
+
+    lexicon = load_lexicon(str(source))
+    mapped = load_lexicon(str(target))
+    assert isinstance(mapped, MappedLexicon)
+    assert mapped.lengths() == lexicon.lengths() == [3, 5]
+    assert len(mapped) == len(lexicon) == len(WORDS)
+    for pattern in ["_____", "P____", "__T__", "_A___", "CA_", "_A_", "__T", "Ä____", "XYZ", "____"]:
+        assert mapped.match(pattern) == lexicon.match(pattern), pattern
+        assert mapped.count(pattern) == lexicon.count(pattern), pattern
+    for word, clue, _ in WORDS:
+        assert word.upper() in mapped
+        assert mapped.clue(word) == lexicon.clue(word) == clue
+    assert "DOG" not in mapped
+    assert mapped.clue("DOG") == ""
+
+
+def test_lexicon_orders_by_frequency(tmp_path):
+    source = tmp_path / "words.txt"
+    _write_words(source)
+    assert load_lexicon(str(source)).match("_____") == ["PASTA", "PIZZA", "ÄPPLE", "TACOS"]
+    assert Lexicon(["cat", "Cat", "c-t"]).match("___") == ["CAT"]
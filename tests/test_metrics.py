@@ -0,0 +1,27 @@
+from crossy import metrics
+
+
+def test_metrics_are_only_recorded_when_enabled(monkeypatch):
+    monkeypatch.setattr(metrics, "_enabled", False)
+    metrics.reset()
+    metrics.increment("test.calls")
+    with metrics.timer("test.duration"):
+        pass
+    assert metrics.snapshot() == {"counters": {}, "histograms": {}}
+
+    recorded = []
+    metrics.set_sink(lambda kind, name, value: recorded.append((kind, name)))
+    try:
+        metrics.increment("test.calls")
+    finally:
+        metrics.set_sink(None)
+    assert recorded == [("counter", "test.calls")]
+
+    metrics.enable()
+    metrics.increment("test.calls", 2)
+    with metrics.timer("test.duration"):
+        pass
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"] == {"test.calls": 3}
+    assert snapshot["histograms"]["test.duration"]["count"] == 1
+    metrics.reset()
@@ -0,0 +1,98 @@
+import random
+
+import pytest
+
+from crossy import model
+from crossy.model import Crossword, Direction, Word, generate_word_pattern
+
+
+def _layout(seed: int, width: int = 20, height: int = 20, num_words: int = 12) -> Crossword:
+    random.seed(seed)
+    crossword = Crossword(width, height)
+    for word in generate_word_pattern(width, height, num_words):
+        word.word = word.word.replace("-", " ")
+        crossword.add_word(word)
+    return crossword
+
+
+def test_to_bytes_round_trip():
+    crossword = _layout(1)
+    crossword.topic = "Smörgåsbord"
+    crossword.update_word(0, "A" * len(crossword.words[0].word), "First clue")
+
+    loaded = Crossword.from_bytes(crossword.to_bytes())
+
+    assert (loaded.width, loaded.height, loaded.topic) == (crossword.width, crossword.height, crossword.topic)
+    assert [word.dict() for word in loaded.words] == [word.dict() for word in crossword.words]
+    assert loaded.get_grid() == crossword.get_grid()
+    assert loaded.get_layout() == crossword.get_layout()
+    assert loaded.get_crossings() == crossword.get_crossings()
+
+
+def test_to_bytes_round_trip_empty():
+    loaded = Crossword.from_bytes(Crossword(5, 7).to_bytes())
+    assert (loaded.width, loaded.height, loaded.words) == (5, 7, [])
+
+
+def test_add_slot_skips_placement_rules():
+    crossword = Crossword(3, 2)
+    # Two across words side by side, which add_word refuses
+    crossword.add_slot(Word("ABC", 0, 0, Direction.ACROSS))
+    crossword.add_slot(Word("DEF", 0, 1, Direction.ACROSS))
+    crossword.add_slot(Word("AD", 0, 0, Direction.DOWN))
+    assert crossword.get_grid() == [["A", "B", "C"], ["D", "E", "F"]]
+    assert crossword.words_at(0, 1) == [(1, 0), (2, 1)]
+    assert crossword.words_at(2, 1) == [(1, 2)]
+    assert crossword.words_at(5, 5) == []
+    assert crossword.word_coordinates(crossword.words[2]) == [(0, 0), (0, 1)]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_crossing_placements_match_fallback(monkeypatch, seed):
+    pytest.importorskip("numpy")
+    crossword = _layout(seed)
+    with_numpy = [
+        [word.dict() for word in crossword.get_crossing_placements(parent, 3, 8)] for parent in crossword.words
+    ]
+    legal_with_numpy = [word.dict() for word in crossword.get_legal_placements(Direction.DOWN, 4)]
+    open_with_numpy = [word.dict() for word in crossword.get_open_placements(Direction.DOWN, 4)]
+
+    monkeypatch.setattr(model, "np", None)
+    fallback = [
+        [word.dict() for word in crossword.get_crossing_placements(parent, 3, 8)] for parent in crossword.words
+    ]
+    assert with_numpy == fallback
+    assert legal_with_numpy == [word.dict() for word in crossword.get_legal_placements(Direction.DOWN, 4)]
+    assert open_with_numpy == [word.dict() for word in crossword.get_open_placements(Direction.DOWN, 4)]
+
+
+def test_crossword_string_format():
+    crossword = Crossword(5, 4)
+    crossword.add_word(Word("PIZZA", 0, 1, Direction.ACROSS, "Italian dish"))
+    crossword.add_word(Word("OZO", 2, 0, Direction.DOWN))
+    crossword.add_word(Word("APE", 4, 1, Direction.DOWN, "Mimic"))
+    assert crossword.get_crossword_string() == (
+        "    0 1 2 3 4\n"
+        "  -----------\n"
+        " 0|    O     |\n"
+        " 1|P I Z Z A |\n"
+        " 2|    O   P |\n"
+        " 3|        E |\n"
+        "  -----------\n"
+        "\nClues:\n"
+        "\nAcross:\n"
+        "  (0, 1) PIZZA - Italian dish\n"
+        "\nDown:\n"
+        "  (2, 0) OZO\n"
+        "  (4, 1) APE - Mimic"
+    )
+
+
+def test_render_cache_follows_changes():
+    crossword = Crossword(5, 5)
+    crossword.add_word(Word("     ", 0, 0, Direction.ACROSS))
+    text = crossword.get_crossword_string()
+    assert crossword.get_crossword_string() is text
+
+    crossword.update_word(0, "PIZZA", "Italian dish")
+    assert "PIZZA - Italian dish" in crossword.get_crossword_string()
@@ -0,0 +1,39 @@
+from crossy.model import Crossword, Direction, Word
+
+
+def _grid() -> Crossword:
+    """An across word crossed by two down words, one of them already filled."""
+    crossword = Crossword(7, 5)
+    crossword.add_word(Word("     ", 0, 1, Direction.ACROSS))
+    crossword.add_word(Word("CAT", 1, 0, Direction.DOWN))
+    crossword.add_word(Word("   ", 3, 0, Direction.DOWN))
+    return crossword
+
+
+def test_edges_and_degree():
+    graph = _grid().get_slot_graph()
+    assert sorted(graph.edges[0]) == [(1, 1, 1), (3, 2, 1)]
+    assert graph.edges[1] == [(1, 0, 1)]
+    assert [graph.degree(slot) for slot in range(len(graph))] == [2, 1, 1]
+
+
+def test_fill_order_and_propagate():
+    crossword = _grid()
+    graph = crossword.get_slot_graph()
+    patterns = [crossword.get_letter_constraints_for_word(word).pattern for word in crossword.words]
+    # The across word has a known letter, which makes it more constrained than the empty down word
+    assert graph.fill_order(patterns) == [0, 2]
+
+    crossword.update_word(0, "PASTA")
+    assert sorted(graph.propagate(0, "PASTA", patterns)) == [1, 2]
+    assert patterns[2] == [None, "T", None]
+    assert crossword.get_slot_graph() is graph
+
+
+def test_fill_waves_do_not_cross():
+    crossword = _grid()
+    graph = crossword.get_slot_graph()
+    waves = crossword.get_fill_waves()
+    assert sorted(slot for wave in waves for slot in wave) == [0, 1, 2]
+    for wave in waves:
+        assert not any(other in wave for slot in wave for _, other, _ in graph.edges[slot])